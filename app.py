@@ -116,7 +116,7 @@ import logging
 import hashlib
 import elev
 from datetime import datetime, timezone
-from gefs import listdir_gefs, open_gefs
+from gefs import listdir_gefs, read_whichgefs, prefetch_files
 import simulate
 import downloader
 from pathlib import Path
@@ -571,6 +571,10 @@ def wait_for_prefetch(model_ids, worker_pid, timeout=120, min_models=12):
     
     print(f"INFO: [WORKER {worker_pid}] Starting prefetch with cycle: {prefetch_gefs}", flush=True)
     
+    # Start every model download at once (bounded by gefs' download semaphore) so the
+    # simulator-building threads below find files on disk instead of downloading 10 at a time
+    prefetch_files([f'{prefetch_gefs}_{str(model_id).zfill(2)}.npz' for model_id in model_ids])
+    
     # Phase 5: Submit prefetch tasks (cycle validated, ref counts acquired)
     executor = ThreadPoolExecutor(max_workers=min(10, len(model_ids)))
     try:
@@ -1177,10 +1181,8 @@ def favicon():
 @app.route('/sim/which')
 def whichgefs():
     """Get current GEFS timestamp."""
-    f = open_gefs('whichgefs')
-    s = f.readline()
-    f.close()
-    return s
+    lines = read_whichgefs().splitlines(keepends=True)
+    return lines[0] if lines else ""
 
 @app.route('/sim/test-s3')
 def test_s3():
@@ -1366,9 +1368,7 @@ def status():
     Access logging is suppressed for this endpoint to reduce Railway log noise.
     """
     try:
-        f = open_gefs('whichgefs')
-        line = f.readline()
-        f.close()
+        line = read_whichgefs()
         # If we got a valid line (non-empty), server is ready
         if line and line.strip():
             return "Ready"
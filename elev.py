@@ -7,7 +7,7 @@ Thread-safe singleton pattern ensures data is loaded only once per process.
 """
 import numpy as np
 import threading
-from gefs import load_gefs
+from gefs import load_gefs_mmap
 
 # Module-level cache for elevation data (shared across all threads in process)
 _ELEV_DATA = None
@@ -38,10 +38,9 @@ def _get_elev_data():
         # Another thread may have loaded it while we waited for lock
         if _ELEV_DATA is not None:
             return _ELEV_DATA, _ELEV_SHAPE
-        # Load from S3 cache (downloads if not cached)
-        path = load_gefs('worldelev.npy')
-        # Memory-map the file (doesn't load entire 451MB into RAM)
-        _ELEV_DATA = np.load(path, mmap_mode='r')
+        # Load from S3 cache (downloads if not cached) as a read-only memory map
+        # (doesn't load entire 451MB into RAM; pages shared across workers)
+        _ELEV_DATA = load_gefs_mmap('worldelev.npy')
         _ELEV_SHAPE = _ELEV_DATA.shape
         return _ELEV_DATA, _ELEV_SHAPE
 
@@ -4,21 +4,37 @@ GEFS (Global Ensemble Forecast System) data management from AWS S3.
 Handles downloading, caching, and serving GEFS weather model files.
 Uses S3 TransferManager for multipart parallel downloads (faster, more resilient).
 Implements LRU cache with disk persistence and connection pooling.
-Provides load_gefs() for memory-mapped file access and open_gefs() for text files.
+Provides load_gefs() for memory-mapped file access, open_gefs() for text files and
+read_whichgefs() for the cached current-cycle string.
 """
 import io
+import mmap
 import os
+import re
+import struct
 import tempfile
 import time
 import logging
 from pathlib import Path
 import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
+# fcntl is POSIX-only; without it downloads fall back to semaphore-only coordination
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import numpy as np
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 from botocore.config import Config
 from boto3.s3.transfer import TransferConfig
 
+# KEY=value lines (comments and blank lines never match); parsed in one regex pass
+_ENV_RE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.MULTILINE)
+
 # Try to load from .env file if available (non-fatal)
 def _load_env_file():
     """Load environment variables from .env file if present.
@@ -28,12 +44,8 @@ def _load_env_file():
     for env_file in env_files:
         if env_file.exists():
             try:
-                with open(env_file) as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            os.environ.setdefault(key.strip(), value.strip())
+                for key, value in _ENV_RE.findall(env_file.read_text(encoding='utf-8', errors='ignore')):
+                    os.environ.setdefault(key, value)
             except Exception:
                 # Non-fatal: rely on existing os.environ
                 pass
@@ -58,33 +70,42 @@ if not _AWS_SECRET_ACCESS_KEY:
 storage_type = "Cloudflare R2" if _S3_ENDPOINT_URL else "AWS S3"
 print(f"INFO: {storage_type} configured: bucket={_BUCKET}, endpoint={_S3_ENDPOINT_URL or 'default'}", flush=True)
 
+# Download concurrency: files in flight per worker, and TransferManager threads per file
+_MAX_CONCURRENT_DOWNLOADS = 16
+_TRANSFER_MAX_CONCURRENCY = 16
+
 # Configure boto3 with retries and connection pooling
-# Increased to 64 connections for ensemble workloads (2 devices × 21 models = 42 concurrent downloads)
+# Pool holds every TransferManager thread of every concurrent download (prefetch runs
+# _MAX_CONCURRENT_DOWNLOADS files at once) plus headroom for head_object. botocore
+# doesn't block when the pool is full - it opens an extra connection and discards it
+# after the request - so an undersized pool means a TLS handshake per multipart range.
+# Connections are opened lazily, so a single-file download only holds its own threads'.
 _S3_CONFIG = Config(
     retries={'max_attempts': 3, 'mode': 'adaptive'},
-    max_pool_connections=64,  # Increased from 32 for high concurrency
+    max_pool_connections=_MAX_CONCURRENT_DOWNLOADS * _TRANSFER_MAX_CONCURRENCY + 8,
+    tcp_keepalive=True,  # Keep idle pooled connections alive between downloads
     connect_timeout=15,
     read_timeout=60,
 )
 
-# Main S3 client for large file downloads (simulations)
+# Endpoint/credential settings shared by every S3 client (computed once)
 # Explicitly pass credentials to avoid boto3 credential chain picking up wrong credentials
 # For R2, use endpoint_url and set region to 'auto' (R2 doesn't use regions)
-_S3_CLIENT_KWARGS = {
+_S3_BASE_KWARGS = {
     'service_name': 's3',
     'aws_access_key_id': _AWS_ACCESS_KEY_ID,
     'aws_secret_access_key': _AWS_SECRET_ACCESS_KEY,
-    'config': _S3_CONFIG,
 }
 if _S3_ENDPOINT_URL:
     # Cloudflare R2: use endpoint_url and auto region
-    _S3_CLIENT_KWARGS['endpoint_url'] = _S3_ENDPOINT_URL
-    _S3_CLIENT_KWARGS['region_name'] = 'auto'
+    _S3_BASE_KWARGS['endpoint_url'] = _S3_ENDPOINT_URL
+    _S3_BASE_KWARGS['region_name'] = 'auto'
 else:
     # AWS S3: use region
-    _S3_CLIENT_KWARGS['region_name'] = _AWS_REGION
+    _S3_BASE_KWARGS['region_name'] = _AWS_REGION
 
-_S3_CLIENT = boto3.client(**_S3_CLIENT_KWARGS)
+# Main S3 client for large file downloads (simulations)
+_S3_CLIENT = boto3.client(**_S3_BASE_KWARGS, config=_S3_CONFIG)
 
 # Separate S3 client for status checks (small files like whichgefs)
 # This ensures status checks never wait behind large file downloads
@@ -94,35 +115,24 @@ _STATUS_S3_CONFIG = Config(
     connect_timeout=3,
     read_timeout=10,
 )
-# Separate S3 client for status checks (small files like whichgefs)
 # Uses same endpoint configuration as main client
-_STATUS_S3_CLIENT_KWARGS = {
-    'service_name': 's3',
-    'aws_access_key_id': _AWS_ACCESS_KEY_ID,
-    'aws_secret_access_key': _AWS_SECRET_ACCESS_KEY,
-    'config': _STATUS_S3_CONFIG,
-}
-if _S3_ENDPOINT_URL:
-    # Cloudflare R2: use endpoint_url and auto region
-    _STATUS_S3_CLIENT_KWARGS['endpoint_url'] = _S3_ENDPOINT_URL
-    _STATUS_S3_CLIENT_KWARGS['region_name'] = 'auto'
-else:
-    # AWS S3: use region
-    _STATUS_S3_CLIENT_KWARGS['region_name'] = _AWS_REGION
-
-_STATUS_S3_CLIENT = boto3.client(**_STATUS_S3_CLIENT_KWARGS)
+_STATUS_S3_CLIENT = boto3.client(**_S3_BASE_KWARGS, config=_STATUS_S3_CONFIG)
 
 # S3 TransferManager configuration for multipart parallel downloads
 # Optimized for large files (300-450MB): uses 8MB chunks with 16 parallel threads
 # TransferManager handles retries automatically, so we don't need manual retry logic
 _TRANSFER_CONFIG = TransferConfig(
     multipart_threshold=1024 * 1024 * 8,  # 8MB - files larger than this use multipart
-    max_concurrency=16,  # Parallel threads for multipart downloads
+    max_concurrency=_TRANSFER_MAX_CONCURRENCY,  # Parallel threads for multipart downloads
     multipart_chunksize=1024 * 1024 * 8,  # 8MB chunks
+    io_chunksize=1024 * 1024 * 4,  # 4MB read/write granularity (default 256KB) - fewer Python-level copies/syscalls
     use_threads=True  # Use threads for parallel chunk downloads
 )
 
 _CACHEABLE_SUFFIXES = (".npz", ".npy")
+# WindFile's uncompressed extraction of X.npz lives beside it as X.npz.data.npy. It is not
+# a cache entry of its own: not counted toward _MAX_CACHED_FILES, evicted with its .npz
+_EXTRACTED_SUFFIX = ".npz.data.npy"
 # Use Railway persistent volume if available, fallback to tempdir
 _default_cache_dir = None
 if Path("/app/data").exists():  # Railway persistent volume mount
@@ -134,15 +144,30 @@ _CACHE_DIR.mkdir(parents=True, exist_ok=True)
 _CACHE_LOCK = threading.Lock()
 _MAX_CACHED_FILES = 30  # Allow 30 weather files (~9.2GB) - increased for 32GB RAM system, handles full 21-model ensemble + buffer
 
-# Lightweight whichgefs cache: we still check the ETag every poll, but only download the body
-# when the hash changes so we can detect cycle flips without hammering S3.
-_whichgefs_cache = {"value": None, "timestamp": 0, "ttl": 15, "etag": None}
+# Lightweight whichgefs cache: we check the ETag on each poll (unless another worker just did),
+# but only download the body when the hash changes so we can detect cycle flips without hammering S3.
+# Immutable (value, etag, checked_at) tuple, rebound atomically so readers never need the lock;
+# _whichgefs_lock only serializes the S3 refresh (held by the background refresher while one
+# is in flight). Times are time.monotonic() (immune to clock jumps).
+_whichgefs_cache = (None, None, 0.0)
+_WHICHGEFS_TTL = 15  # seconds a cached body is trusted without re-downloading on ETag match
+_WHICHGEFS_STALE_MAX = 60  # seconds a value may be served while a background refresh runs
 _whichgefs_lock = threading.Lock()
 
+# Cross-worker whichgefs cache: small mmap-backed file in the cache dir holding the last
+# ETag check result, so one worker's S3 check serves every worker for a few seconds.
+# Layout: header (checked_at float64, etag length uint32, value length uint32) + etag + value
+# checked_at is time.monotonic(), which is system-wide on Linux (comparable across workers)
+_WHICHGEFS_SHARED_PATH = _CACHE_DIR / "whichgefs.cache"
+_WHICHGEFS_SHARED_SIZE = 16 * 1024
+_WHICHGEFS_SHARED_HEADER = struct.Struct('<dII')
+_WHICHGEFS_SHARED_TTL = 5  # seconds; bounds how stale a cycle flip can be across workers
+_whichgefs_shared = {"pid": None, "fd": None, "mm": None}
+
 # Track files currently being downloaded to prevent premature deletion during cleanup
 # Critical for multi-worker environments where cleanup could delete files mid-download
+# Mutated only under _CACHE_LOCK; cleanup does membership tests against the live set
 _downloading_files = set()
-_downloading_lock = threading.Lock()
 
 # Track recently downloaded files with timestamps to protect them from cleanup
 # Files are protected for 5 minutes after download to prevent race conditions where
@@ -151,6 +176,13 @@ _recently_downloaded = {}  # {file_name: download_timestamp}
 _recently_downloaded_lock = threading.Lock()
 _RECENT_DOWNLOAD_GRACE_PERIOD = 300  # 5 minutes protection
 
+# Running count of cached files (excluding worldelev.npy) so cleanup can return before
+# scanning the directory when well under the limit. Maintained locally on download/evict;
+# resynced by a real scan periodically since other workers also add files.
+_cached_count = 0
+_cached_count_synced = 0.0  # 0 forces a scan on first cleanup
+_CACHED_COUNT_RESYNC_SECONDS = 60
+
 def _finalize_cached_file(file_name: str, cache_path: Path) -> Path:
     """Finalize a cached file: touch it, remove from downloading set, and protect from cleanup.
     
@@ -168,24 +200,28 @@ def _finalize_cached_file(file_name: str, cache_path: Path) -> Path:
         The cache_path (for chaining)
     """
     cache_path.touch()  # Update access time
-    with _downloading_lock:
+    with _CACHE_LOCK:
         _downloading_files.discard(file_name)
     with _recently_downloaded_lock:
         _recently_downloaded[file_name] = time.time()
     return cache_path
 
-# Limit concurrent downloads to prevent connection pool exhaustion
+# Limit concurrent downloads per worker
 # During ensemble, 21 models try to download simultaneously - too many for S3
 # Increased from 8 to 16 to reduce prefetch starvation (H3 from code review)
 # Progressive prefetch waits for 12 models - with 16 concurrent, less blocking
-# With 4 workers × 16 downloads = 64 max concurrent, at connection pool limit
-_download_semaphore = threading.Semaphore(16)
+# Bounds storage-side load (R2/S3 request rate), not connection pool depth
+_download_semaphore = threading.Semaphore(_MAX_CONCURRENT_DOWNLOADS)
+
+# Background executor for bulk prefetch (created lazily per process - threads don't survive fork)
+_prefetch_executor = None
+_prefetch_executor_pid = None
+_prefetch_executor_lock = threading.Lock()
 
 def _release_file_lock(lock_fd):
     """Release file lock and close file descriptor. Safe to call multiple times."""
     if lock_fd:
         try:
-            import fcntl
             fcntl.flock(lock_fd.fileno(), fcntl.LOCK_UN)
             lock_fd.close()
         except Exception:
@@ -202,73 +238,187 @@ def listdir_gefs():
         print(f"ERROR: Failed to list S3 bucket {_BUCKET}: {e}", flush=True)
         return []
 
-def open_gefs(file_name):
-    """Open GEFS file from S3. Uses head_object for whichgefs to reduce bandwidth/cost."""
-    if file_name == 'whichgefs':
-        now = time.time()
-        
-        # Try to acquire lock (non-blocking first, then blocking with timeout)
-        if not _whichgefs_lock.acquire(blocking=False):
-            # Another thread is fetching - wait briefly and check if it completed
-            if _whichgefs_lock.acquire(blocking=True, timeout=1.0):
-                try:
-                    # Check if cache was updated by other thread (it will have checked ETag)
-                    if (_whichgefs_cache["value"] is not None and 
-                        now - _whichgefs_cache["timestamp"] < _whichgefs_cache["ttl"]):
-                        return io.StringIO(_whichgefs_cache["value"])
-                finally:
-                    _whichgefs_lock.release()
-            # If still no cache, return cached value if available (fallback)
-            if _whichgefs_cache["value"] is not None:
-                return io.StringIO(_whichgefs_cache["value"])
-            return io.StringIO("")
-        
+def _whichgefs_shared_map():
+    """Return (fd, mmap) for the shared whichgefs cache file, opened once per process.
+    
+    Opened lazily after fork: flock locks belong to the open file description, so a
+    descriptor inherited from the Gunicorn master would not exclude sibling workers.
+    """
+    pid = os.getpid()
+    if _whichgefs_shared["pid"] != pid:
+        fd = os.open(_WHICHGEFS_SHARED_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(fd).st_size < _WHICHGEFS_SHARED_SIZE:
+            os.ftruncate(fd, _WHICHGEFS_SHARED_SIZE)
+        _whichgefs_shared["mm"] = mmap.mmap(fd, _WHICHGEFS_SHARED_SIZE)
+        _whichgefs_shared["fd"] = fd
+        _whichgefs_shared["pid"] = pid
+    return _whichgefs_shared["fd"], _whichgefs_shared["mm"]
+
+def _read_whichgefs_shared():
+    """Return (checked_at, etag, value) from the shared cache, or None if empty/unavailable."""
+    if fcntl is None:
+        return None
+    try:
+        fd, mm = _whichgefs_shared_map()
+        fcntl.flock(fd, fcntl.LOCK_SH)
         try:
-            # CRITICAL: Always check ETag to detect cycle changes immediately
-            # Even if cache is fresh, we must verify file hasn't changed
-            try:
-                # Use head_object to check ETag (reduces bandwidth/cost)
-                response = _STATUS_S3_CLIENT.head_object(Bucket=_BUCKET, Key=file_name)
-                etag = response.get('ETag', '').strip('"')
-                
-                # If cache is fresh AND ETag matches, return cached value
-                if (_whichgefs_cache["value"] is not None and 
-                    _whichgefs_cache["etag"] is not None and
-                    _whichgefs_cache["etag"] == etag and
-                    now - _whichgefs_cache["timestamp"] < _whichgefs_cache["ttl"]):
-                    # File hasn't changed - return cached value
-                    _whichgefs_cache["timestamp"] = now  # Update timestamp
-                    return io.StringIO(_whichgefs_cache["value"])
-                
-                # ETag mismatch or cache expired - fetch new content
-                # whichgefs is tiny (~10 bytes), so this is still efficient
-                content_response = _STATUS_S3_CLIENT.get_object(Bucket=_BUCKET, Key=file_name)
-                content = content_response['Body'].read().decode("utf-8")
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-                error_msg = e.response.get('Error', {}).get('Message', str(e))
-                print(f"ERROR: S3 error reading {file_name}: Code={error_code}, Message={error_msg}", flush=True)
-                if error_code == 'NoSuchKey':
-                    print(f"WARNING: File not found in S3: {file_name}", flush=True)
-                    return io.StringIO("")
-                raise
-            except Exception as e:
-                print(f"ERROR: Unexpected error reading {file_name} from S3: {type(e).__name__}: {e}", flush=True)
-                raise
-            
-            # Update cache with new content and ETag
-            _whichgefs_cache["value"] = content
-            _whichgefs_cache["timestamp"] = now
-            _whichgefs_cache["etag"] = etag
-            return io.StringIO(content)
+            checked_at, etag_len, value_len = _WHICHGEFS_SHARED_HEADER.unpack_from(mm, 0)
+            offset = _WHICHGEFS_SHARED_HEADER.size
+            if not checked_at or offset + etag_len + value_len > _WHICHGEFS_SHARED_SIZE:
+                return None
+            etag = mm[offset:offset + etag_len].decode("utf-8")
+            value = mm[offset + etag_len:offset + etag_len + value_len].decode("utf-8")
         finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        return checked_at, etag, value
+    except (OSError, ValueError):
+        return None
+
+def _write_whichgefs_shared(checked_at, etag, value):
+    """Publish an ETag check result to the shared cache (best effort)."""
+    if fcntl is None:
+        return
+    etag_bytes = etag.encode("utf-8")
+    value_bytes = value.encode("utf-8")
+    offset = _WHICHGEFS_SHARED_HEADER.size
+    if offset + len(etag_bytes) + len(value_bytes) > _WHICHGEFS_SHARED_SIZE:
+        return
+    try:
+        fd, mm = _whichgefs_shared_map()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            mm[offset:offset + len(etag_bytes)] = etag_bytes
+            mm[offset + len(etag_bytes):offset + len(etag_bytes) + len(value_bytes)] = value_bytes
+            _WHICHGEFS_SHARED_HEADER.pack_into(mm, 0, checked_at, len(etag_bytes), len(value_bytes))
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    except (OSError, ValueError):
+        pass
+
+def read_whichgefs():
+    """Return the current whichgefs contents as a str (empty string if unavailable).
+    
+    Cached per process and shared across workers: the ETag is checked against S3 unless
+    this worker or another one checked within _WHICHGEFS_SHARED_TTL seconds, so cycle
+    flips are seen within a few seconds. Fresh cache hits take no lock at all. Once the
+    value is due for a check but younger than _WHICHGEFS_STALE_MAX, it is still returned
+    immediately while a single background thread revalidates it (stale-while-revalidate);
+    only a missing or very stale value makes the caller wait on S3. Returns the cached
+    string itself (no copy), so status polls can call splitlines()/strip() directly.
+    """
+    # Lock-free fast path: recently checked value
+    cached_value, cached_etag, checked_at = _whichgefs_cache
+    now = time.monotonic()
+    if cached_value is not None and now - checked_at < _WHICHGEFS_SHARED_TTL:
+        return cached_value
+    
+    # Stale-while-revalidate: serve the current value, refresh in the background
+    # Holding _whichgefs_lock marks the refresh as in flight, so at most one runs per worker
+    if cached_value is not None and now - checked_at < _WHICHGEFS_STALE_MAX:
+        if _whichgefs_lock.acquire(blocking=False):
+            try:
+                threading.Thread(target=_refresh_whichgefs_background,
+                                 name="whichgefs-refresh", daemon=True).start()
+            except RuntimeError:
+                _whichgefs_lock.release()
+        return cached_value
+    
+    # Try to acquire lock (non-blocking first, then blocking with timeout)
+    if not _whichgefs_lock.acquire(blocking=False):
+        # Another thread is fetching - wait briefly and check if it completed
+        if _whichgefs_lock.acquire(blocking=True, timeout=1.0):
             _whichgefs_lock.release()
+            # Check if cache was updated by other thread (it will have checked ETag)
+            cached_value, _, checked_at = _whichgefs_cache
+            if cached_value is not None and now - checked_at < _WHICHGEFS_TTL:
+                return cached_value
+        # If still no cache, return cached value if available (fallback)
+        return cached_value if cached_value is not None else ""
+    
+    try:
+        return _refresh_whichgefs()
+    finally:
+        _whichgefs_lock.release()
+
+def _refresh_whichgefs_background():
+    """Background revalidation for read_whichgefs(); the caller already holds _whichgefs_lock."""
+    try:
+        _refresh_whichgefs()
+    except Exception:
+        pass  # Already logged; readers keep the stale value until _WHICHGEFS_STALE_MAX
+    finally:
+        _whichgefs_lock.release()
+
+def _refresh_whichgefs():
+    """Check whichgefs against the shared cache / S3 and update _whichgefs_cache.
+    Must be called with _whichgefs_lock held."""
+    global _whichgefs_cache
+    file_name = 'whichgefs'
+    
+    # Re-check under the lock: another thread may have refreshed while we waited
+    cached_value, cached_etag, checked_at = _whichgefs_cache
+    now = time.monotonic()
+    if cached_value is not None and now - checked_at < _WHICHGEFS_SHARED_TTL:
+        return cached_value
+    
+    # Another worker checked the ETag very recently - reuse its result (no S3 call)
+    shared = _read_whichgefs_shared()
+    if shared is not None and 0 <= now - shared[0] < _WHICHGEFS_SHARED_TTL:
+        shared_checked_at, etag, content = shared
+        _whichgefs_cache = (content, etag, shared_checked_at)
+        return content
+    
+    # CRITICAL: Otherwise check ETag to detect cycle changes promptly
+    # Even if cache is fresh, we must verify file hasn't changed
+    try:
+        # Use head_object to check ETag (reduces bandwidth/cost)
+        response = _STATUS_S3_CLIENT.head_object(Bucket=_BUCKET, Key=file_name)
+        etag = response.get('ETag', '').strip('"')
+        
+        # If cache is fresh AND ETag matches, return cached value
+        if (cached_value is not None and 
+            cached_etag is not None and
+            cached_etag == etag and
+            now - checked_at < _WHICHGEFS_TTL):
+            # File hasn't changed - return cached value
+            _whichgefs_cache = (cached_value, etag, now)
+            _write_whichgefs_shared(now, etag, cached_value)
+            return cached_value
+        
+        # ETag mismatch or cache expired - fetch new content
+        # whichgefs is tiny (~10 bytes), so this is still efficient
+        content_response = _STATUS_S3_CLIENT.get_object(Bucket=_BUCKET, Key=file_name)
+        content = content_response['Body'].read().decode("utf-8")
+    except ClientError as e:
+        error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+        error_msg = e.response.get('Error', {}).get('Message', str(e))
+        print(f"ERROR: S3 error reading {file_name}: Code={error_code}, Message={error_msg}", flush=True)
+        if error_code == 'NoSuchKey':
+            print(f"WARNING: File not found in S3: {file_name}", flush=True)
+            return ""
+        raise
+    except Exception as e:
+        print(f"ERROR: Unexpected error reading {file_name} from S3: {type(e).__name__}: {e}", flush=True)
+        raise
+    
+    # Update cache with new content and ETag (single atomic rebind)
+    _whichgefs_cache = (content, etag, now)
+    _write_whichgefs_shared(now, etag, content)
+    return content
+
+def open_gefs(file_name):
+    """Open GEFS file from S3 as a text file object.
+    whichgefs is served from read_whichgefs()'s cache (kept for backwards compatibility;
+    new callers should use read_whichgefs() directly)."""
+    if file_name == 'whichgefs':
+        return io.StringIO(read_whichgefs())
     
     # For non-whichgefs files, use get_object (normal text files)
+    # BytesIO shares the downloaded buffer and TextIOWrapper decodes lazily as the caller
+    # reads, avoiding separate bytes -> str -> StringIO copies of the whole body
     try:
         response = _S3_CLIENT.get_object(Bucket=_BUCKET, Key=file_name)
-        content = response['Body'].read().decode("utf-8")
-        return io.StringIO(content)
+        return io.TextIOWrapper(io.BytesIO(response['Body'].read()), encoding="utf-8")
     except ClientError as e:
         if e.response['Error']['Code'] == 'NoSuchKey':
             raise FileNotFoundError(f"File not found in S3: {file_name}")
@@ -276,7 +426,9 @@ def open_gefs(file_name):
 
 def load_gefs(file_name):
     """Load GEFS file from cache or download from S3.
-    Returns path to cached file for memory-mapped access."""
+    Returns path to cached file, intended for np.load(path, mmap_mode='r') so pages
+    are faulted in lazily and shared across workers through the page cache.
+    Non-cacheable files are returned as an in-memory BytesIO."""
     load_start = time.time()
     
     if _should_cache(file_name):
@@ -304,7 +456,63 @@ def load_gefs(file_name):
             raise FileNotFoundError(f"File not found in S3: {file_name}")
         raise
 
+def load_gefs_mmap(file_name, mmap_mode='r'):
+    """Load a cacheable GEFS file (.npy/.npz) as a read-only memory map.
+    
+    For .npy this returns a np.memmap-backed array; for .npz NumPy reads the zip
+    directory once and returns an NpzFile (caller must close it).
+    """
+    if not _should_cache(file_name):
+        raise ValueError(f"{file_name} is not a cacheable .npy/.npz file")
+    return np.load(load_gefs(file_name), mmap_mode=mmap_mode, allow_pickle=False)
+
+def prefetch_files(file_names):
+    """Start downloading several cacheable files concurrently in the background.
+    
+    Submits every file at once (bounded by _download_semaphore) so bulk fetches such as
+    the 21-model ensemble overlap instead of waiting on callers' own thread pools.
+    Files already downloading in this process are skipped; later load_gefs() calls
+    for the same file block on the download lock and pick up the finished file.
+    Returns the list of submitted futures (errors are logged, not raised).
+    """
+    global _prefetch_executor, _prefetch_executor_pid
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None or _prefetch_executor_pid != os.getpid():
+            _prefetch_executor = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_DOWNLOADS,
+                                                    thread_name_prefix="gefs-prefetch")
+            _prefetch_executor_pid = os.getpid()
+        executor = _prefetch_executor
+
+    def _prefetch_one(file_name):
+        try:
+            return _ensure_cached(file_name)
+        except Exception as e:
+            print(f"WARNING: Background prefetch of {file_name} failed: {e}", flush=True)
+            return None
+
+    return [executor.submit(_prefetch_one, name) for name in file_names
+            if _should_cache(name) and name not in _downloading_files]
+
+def warm_connections():
+    """Open pooled connections to the storage endpoint in the background (best effort).
+    
+    Called per worker after fork (never in the master: pooled sockets must not be shared
+    across processes) so the first status poll / download skips DNS + TCP + TLS setup.
+    """
+    def _warm():
+        try:
+            read_whichgefs()  # Status client (also primes the whichgefs cache)
+            _S3_CLIENT.head_bucket(Bucket=_BUCKET)  # Download client
+        except Exception as e:
+            print(f"WARNING: Storage connection warm-up failed: {e}", flush=True)
+    threading.Thread(target=_warm, name="gefs-warmup", daemon=True).start()
+
 def download_gefs(file_name):
+    """Return a file's full contents as bytes (cacheable files are served from disk cache).
+    
+    This copies the whole file into a private bytes object; for .npy/.npz data that
+    will be fed to NumPy use load_gefs_mmap() instead, which shares page-cached pages.
+    """
     if _should_cache(file_name):
         path = _ensure_cached(file_name)
         with open(path, 'rb') as fp:
@@ -323,29 +531,155 @@ def _should_cache(file_name: str) -> bool:
     return file_name.endswith(_CACHEABLE_SUFFIXES)
 
 
+def _is_nonempty_file(path) -> bool:
+    """True if path exists and is non-empty. One stat() instead of exists() + stat()."""
+    try:
+        return os.stat(path).st_size > 0
+    except FileNotFoundError:
+        return False
+
+
+def _validate_npz(path):
+    """Check NPZ structure by reading only the zip central directory (a few KB).
+    
+    ZipFile() validates the end-of-central-directory record and raises BadZipFile
+    on truncated/corrupted files; no array headers are parsed.
+    """
+    with zipfile.ZipFile(path) as zf:
+        if not zf.namelist():
+            raise IOError(f"{Path(path).name} has empty zip directory")
+
+
+def _atomic_publish(tmp_path: Path, cache_path: Path):
+    """Atomically move a finished download into place without clobbering a peer's copy.
+    
+    os.link() fails if cache_path already exists, so a file another worker published
+    (and that readers may already have memory-mapped) keeps its inode instead of being
+    swapped for an identical one, which would leave both copies in the page cache.
+    Falls back to os.replace() on filesystems without hard-link support.
+    
+    Returns True if this call added the file, False if a peer's copy was already there.
+    """
+    try:
+        os.link(tmp_path, cache_path)
+        created = True
+    except FileExistsError:
+        created = False  # Peer published first - keep theirs
+    except OSError:
+        created = not os.path.exists(cache_path)
+        os.replace(tmp_path, cache_path)
+        return created
+    os.unlink(tmp_path)
+    return created
+
+
+def _cleanup_stale_tmps(max_age=300):
+    """Remove orphaned download temp files (no writes for max_age seconds).
+    
+    Each download attempt writes to a uniquely named temp file, so files left
+    behind by crashed workers are never reused and must be swept. Runs at import
+    and before every download (workers can be killed mid-download at any time).
+    """
+    now = time.time()
+    try:
+        with os.scandir(_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.tmp'):
+                    try:
+                        if now - entry.stat().st_mtime > max_age:
+                            os.unlink(entry.path)
+                    except OSError:
+                        pass  # Removed by another worker
+    except OSError:
+        pass
+
+_cleanup_stale_tmps()
+
+
+def _extraction_in_use(path) -> bool:
+    """True if a WindFile (any process) has this extracted .data.npy mapped.
+    
+    WindFile holds a shared flock on the extraction for as long as it maps it, so a
+    non-blocking exclusive flock fails exactly while some reader is using it.
+    """
+    if fcntl is None:
+        return False
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False  # Already gone
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    finally:
+        os.close(fd)
+
+
 def _cleanup_old_cache_files():
     """Remove least recently used cache files if we exceed file count OR size limits.
     This prevents disk bloat especially after GEFS cycle changes."""
+    global _cached_count, _cached_count_synced
+    # PERFORMANCE: Skip the directory scan entirely while well under the file limit
+    if (_cached_count < _MAX_CACHED_FILES - 5 and
+            time.time() - _cached_count_synced < _CACHED_COUNT_RESYNC_SECONDS):
+        return
     try:
-        # Get all cached files with their access times
+        # Get all cached files in a single directory scan
+        # DirEntry.stat() is cached per entry, so sort + size below share one stat() per file
         cached_files = []
-        for suffix in _CACHEABLE_SUFFIXES:
-            cached_files.extend(_CACHE_DIR.glob(f"*{suffix}"))
+        extracted = {}  # parent .npz name -> DirEntry of its extraction
+        with os.scandir(_CACHE_DIR) as it:
+            for e in it:
+                if e.name.endswith(_EXTRACTED_SUFFIX):
+                    extracted[e.name[:-len(".data.npy")]] = e
+                elif e.name.endswith(_CACHEABLE_SUFFIXES):
+                    cached_files.append(e)
+        
+        # Extractions whose .npz is gone (evicted elsewhere, e.g. an old-cycle file) are
+        # dead weight; drop them unless a reader still has them mapped
+        present = {f.name for f in cached_files}
+        for parent in [p for p in extracted if p not in present]:
+            orphan = extracted.pop(parent)
+            if not _extraction_in_use(orphan.path):
+                try:
+                    os.unlink(orphan.path)
+                except OSError:
+                    pass
+        
+        def entry_size(f):
+            """On-disk size of a cache entry, including its extraction if there is one."""
+            size = f.stat().st_size
+            companion = extracted.get(f.name)
+            if companion is not None:
+                try:
+                    size += companion.stat().st_size
+                except OSError:
+                    pass
+            return size
         
         # Never evict worldelev.npy - it's required and large (451MB)
         # This file is loaded on-demand when users click on the map, so it must stay cached
         worldelev_file = None
         for f in cached_files:
             if f.name == 'worldelev.npy':
-                worldelev_file = f
+                worldelev_file = Path(f.path)
                 break
-        cached_files = [f for f in cached_files if f.name != 'worldelev.npy']
         
         # CRITICAL: Exclude files currently being downloaded by other workers
         # Without this, worker A could delete a file that worker B is actively downloading
-        with _downloading_lock:
-            downloading_names = _downloading_files.copy()
-        cached_files = [f for f in cached_files if f.name not in downloading_names]
+        cached_files = [f for f in cached_files
+                        if f.name != 'worldelev.npy' and f.name not in _downloading_files]
+        # Cleanup runs outside _CACHE_LOCK (trim thread and request threads concurrently), so
+        # every counter update takes the lock; only the scan and unlinks run without it
+        with _CACHE_LOCK:
+            _cached_count = len(cached_files)
+            _cached_count_synced = time.time()
         
         # CRITICAL: Exclude recently downloaded files (within grace period)
         # Prevents race condition where cleanup deletes files before other workers use them
@@ -380,10 +714,14 @@ def _cleanup_old_cache_files():
             # Well under limit, skip size calculation
             return
         
-        total_size_gb = sum(f.stat().st_size for f in cached_files) / (1024**3)
+        total_size_gb = sum(entry_size(f) for f in cached_files) / (1024**3)
         
         # Sort by access time (oldest first) for LRU eviction
         cached_files.sort(key=lambda f: f.stat().st_atime)
+        # Files whose extraction is still mapped count toward the limits but are never
+        # evicted: a reader (or the ensemble about to use it) would have to re-fetch it
+        evictable = [f for f in cached_files
+                     if f.name not in extracted or not _extraction_in_use(extracted[f.name].path)]
         
         # Determine how many files to remove based on both count and size limits
         files_to_remove = 0
@@ -400,11 +738,11 @@ def _cleanup_old_cache_files():
             # Remove files until we're under 24GB (leaves room for growth)
             TARGET_SIZE_GB = 24
             current_size = total_size_gb
-            for i, f in enumerate(cached_files):
+            for i, f in enumerate(evictable):
                 if current_size <= TARGET_SIZE_GB:
                     break
                 try:
-                    file_size_gb = f.stat().st_size / (1024**3)
+                    file_size_gb = entry_size(f) / (1024**3)
                     current_size -= file_size_gb
                     files_to_remove = max(files_to_remove, i + 1)
                 except:
@@ -412,13 +750,20 @@ def _cleanup_old_cache_files():
         
         # Remove the determined number of oldest files
         if files_to_remove > 0:
-            import logging
             removed_count = 0
             removed_size = 0
-            for i in range(min(files_to_remove, len(cached_files))):
+            for i in range(min(files_to_remove, len(evictable))):
                 try:
-                    file_size = cached_files[i].stat().st_size
-                    cached_files[i].unlink()
+                    file_size = entry_size(evictable[i])
+                    os.unlink(evictable[i].path)
+                    companion = extracted.get(evictable[i].name)
+                    if companion is not None:
+                        try:
+                            os.unlink(companion.path)
+                        except FileNotFoundError:
+                            pass
+                    with _CACHE_LOCK:
+                        _cached_count = max(0, _cached_count - 1)
                     removed_count += 1
                     removed_size += file_size
                 except Exception:
@@ -427,12 +772,16 @@ def _cleanup_old_cache_files():
             if removed_count > 0:
                 # Recalculate actual cache size after cleanup (account for concurrent downloads)
                 # Re-scan cache directory to get accurate size including any new files added during cleanup
-                remaining_files = []
-                for suffix in _CACHEABLE_SUFFIXES:
-                    remaining_files.extend(_CACHE_DIR.glob(f"*{suffix}"))
                 # Exclude worldelev.npy from size calculation
-                remaining_files = [f for f in remaining_files if f.name != 'worldelev.npy' and f.exists()]
-                actual_size_gb = sum(f.stat().st_size for f in remaining_files) / (1024**3)
+                actual_size = 0
+                with os.scandir(_CACHE_DIR) as it:
+                    for f in it:
+                        if f.name.endswith(_CACHEABLE_SUFFIXES) and f.name != 'worldelev.npy':
+                            try:
+                                actual_size += f.stat().st_size
+                            except FileNotFoundError:
+                                pass  # Removed concurrently
+                actual_size_gb = actual_size / (1024**3)
                 print(f"INFO: Cache cleanup: removed {removed_count} files ({removed_size/(1024**3):.2f}GB), "
                            f"cache now {actual_size_gb:.2f}GB")
     except Exception as e:
@@ -450,6 +799,7 @@ def _ensure_cached(file_name: str) -> Path:
         FileNotFoundError: If file doesn't exist in S3 (fatal, no retry)
         IOError: For retryable errors (network, incomplete downloads, etc.)
     """
+    global _cached_count
     cache_path = _CACHE_DIR / file_name
     
     if cache_path.exists():
@@ -473,9 +823,7 @@ def _ensure_cached(file_name: str) -> Path:
                 else:
                     # Cycle matches or cycle unavailable - verify file integrity
                     try:
-                        import numpy as np
-                        with np.load(cache_path) as _:
-                            pass
+                        _validate_npz(cache_path)
                     except Exception as e:
                         print(f"WARNING: {file_name} corrupted, re-downloading", flush=True)
                         try:
@@ -492,9 +840,7 @@ def _ensure_cached(file_name: str) -> Path:
             # Non-GEFS file or non-model file - just verify integrity
             try:
                 if file_name.endswith('.npz'):
-                    import numpy as np
-                    with np.load(cache_path) as _:
-                        pass
+                    _validate_npz(cache_path)
             except Exception as e:
                 print(f"WARNING: {file_name} corrupted, re-downloading", flush=True)
                 try:
@@ -507,18 +853,21 @@ def _ensure_cached(file_name: str) -> Path:
 
     cache_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Clean up old files before downloading new one
+    # Runs outside _CACHE_LOCK (as the trim thread already does): an eviction scan/unlink of
+    # ~300MB files must not serialize other threads' cache misses for unrelated files
+    _cleanup_old_cache_files()
+
+    # _CACHE_LOCK only guards the cache-miss check and _downloading_files bookkeeping;
+    # same-file download coordination (threads and workers) is the per-file flock below
     with _CACHE_LOCK:
         if cache_path.exists():
             cache_path.touch()
             return cache_path
 
-        # Clean up old files before downloading new one
-        _cleanup_old_cache_files()
-    
-    # CRITICAL: Mark file as downloading ONLY after cache miss confirmed
-    # This prevents false positives where cache hits would leave files in the set
-    # The _downloading_files set is used by cleanup to avoid deleting files mid-download
-    with _downloading_lock:
+        # CRITICAL: Mark file as downloading ONLY after cache miss confirmed
+        # This prevents false positives where cache hits would leave files in the set
+        # The _downloading_files set is used by cleanup to avoid deleting files mid-download
         _downloading_files.add(file_name)
     
     # INTER-PROCESS COORDINATION: For large files, prevent concurrent downloads across workers
@@ -546,38 +895,23 @@ def _ensure_cached(file_name: str) -> Path:
             lock_fd = open(lock_file, 'a')
             
             # Try to acquire exclusive lock (non-blocking)
-            import fcntl
             try:
                 fcntl.flock(lock_fd.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
                 # Lock acquired - we're the downloader
             except BlockingIOError:
-                # Another worker is downloading - wait and check if it completed
-                # This avoids duplicate downloads and connection pool exhaustion
-                
-                # Wait up to 5 minutes for the download to complete
-                # Poll every second to check if file was created by other worker
-                for i in range(300):  # 300 * 1s = 5 minutes
-                    time.sleep(1)
-                    if cache_path.exists() and cache_path.stat().st_size > 0:
-                        # File was downloaded by another worker - use it
-                        # FIX C-4: Clean up before early return to prevent leak in _downloading_files set
-                        lock_fd.close()
-                        with _downloading_lock:
-                            _downloading_files.discard(file_name)
-                        return _finalize_cached_file(file_name, cache_path)
-                # After 5 minutes, other worker may have failed - acquire lock (blocking) to download ourselves
-                # This handles case where other worker crashed mid-download
+                # Another worker is downloading - block in the kernel until it releases the lock
+                # The downloader holds LOCK_EX until after os.replace(), so we wake the instant
+                # the file is in place (no polling). If the downloader crashes, the kernel drops
+                # its lock and we take over the download ourselves.
                 fcntl.flock(lock_fd.fileno(), fcntl.LOCK_EX)
             
             # RACE CONDITION PROTECTION: Double-check file wasn't created while waiting for lock
             # Another worker may have completed the download between our check and acquiring lock
-            if cache_path.exists() and cache_path.stat().st_size > 0:
+            if _is_nonempty_file(cache_path):
                 # File exists - release lock and use it (no need to download)
-                # FIX C-4: Clean up before early return to prevent leak in _downloading_files set
+                # _finalize_cached_file removes it from _downloading_files (FIX C-4)
                 fcntl.flock(lock_fd.fileno(), fcntl.LOCK_UN)
                 lock_fd.close()
-                with _downloading_lock:
-                    _downloading_files.discard(file_name)
                 return _finalize_cached_file(file_name, cache_path)
         except Exception as e:
             # Lock acquisition failed - continue without lock (fallback to semaphore-only)
@@ -598,17 +932,6 @@ def _ensure_cached(file_name: str) -> Path:
     _download_semaphore.acquire()
     try:
         download_start = time.time()
-        tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
-        
-        # Clean up any stale temp files from previous failed attempts
-        if tmp_path.exists():
-            try:
-                # Check file age - if it's very old (>5 minutes), it's probably stale
-                file_age = time.time() - tmp_path.stat().st_mtime
-                if file_age > 300:  # 5 minutes
-                    tmp_path.unlink()
-            except Exception:
-                pass  # File might have been deleted by another worker
         
         # Get object metadata first to check if it exists and get size
         # This helps distinguish between fatal (file not found) and retryable errors
@@ -630,17 +953,44 @@ def _ensure_cached(file_name: str) -> Path:
         # Use TransferManager for multipart parallel downloads
         # TransferManager handles retries automatically, so we don't need manual retry logic
         # It uses multipart downloads for files > 8MB with 16 parallel threads per download
+        # Bytes actually received (TransferManager progress callback; rewinds on retry).
+        # Needed because preallocation makes the temp file full-size before any data lands.
+        received = [0]
+        received_lock = threading.Lock()
+        def _on_progress(bytes_amount):
+            with received_lock:
+                received[0] += bytes_amount
+        # Temp files of workers killed mid-download (timeout, OOM, RSS watchdog) are
+        # preallocated to full size; sweep them now rather than at the next master start
+        _cleanup_stale_tmps()
+        # Unique temp file per attempt in the cache dir (same filesystem, so os.replace
+        # stays atomic); concurrent or retried attempts can never share a temp file
+        tmp_fh = tempfile.NamedTemporaryFile(dir=_CACHE_DIR, prefix=f"{file_name}.", suffix=".tmp", delete=False)
+        tmp_path = Path(tmp_fh.name)
         try:
-            tmp_path.parent.mkdir(parents=True, exist_ok=True)
-            
             # Download file using TransferManager (multipart parallel download)
             # This is much faster and more resilient than manual streaming
-            _S3_CLIENT.download_file(
-                Bucket=_BUCKET,
-                Key=file_name,
-                Filename=str(tmp_path),
-                Config=_TRANSFER_CONFIG
-            )
+            with tmp_fh as fh:
+                # Preallocate one contiguous extent instead of growing the file per chunk,
+                # and hint sequential access so read-back gets larger readahead.
+                # No FADV_DONTNEED afterwards: we want these pages hot for the mmap readers.
+                if expected_size and hasattr(os, 'posix_fallocate'):
+                    try:
+                        os.posix_fallocate(fh.fileno(), 0, expected_size)
+                    except OSError:
+                        pass  # Filesystem doesn't support it - fall back to normal writes
+                if hasattr(os, 'posix_fadvise'):
+                    try:
+                        os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass  # Advisory only (EINVAL/ESPIPE on some filesystems)
+                _S3_CLIENT.download_fileobj(
+                    Bucket=_BUCKET,
+                    Key=file_name,
+                    Fileobj=fh,
+                    Config=_TRANSFER_CONFIG,
+                    Callback=_on_progress
+                )
         except ClientError as s3_error:
             # S3 API errors - clean up partial file and re-raise
             if tmp_path.exists():
@@ -673,7 +1023,7 @@ def _ensure_cached(file_name: str) -> Path:
             _release_file_lock(lock_fd)
             raise IOError(f"Download failed: temp file not created for {file_name}")
         
-        actual_size = tmp_path.stat().st_size
+        actual_size = min(tmp_path.stat().st_size, received[0])
         if actual_size == 0:
             # Empty file - fatal error
             if tmp_path.exists():
@@ -714,9 +1064,7 @@ def _ensure_cached(file_name: str) -> Path:
         # Validate NPZ file structure before committing
         if file_name.endswith('.npz'):
             try:
-                import numpy as np
-                test_npz = np.load(tmp_path)
-                test_npz.close()  # Close immediately after validation
+                _validate_npz(tmp_path)
             except Exception as e:
                 if tmp_path.exists():
                     try:
@@ -728,13 +1076,17 @@ def _ensure_cached(file_name: str) -> Path:
         
         # CRITICAL: Check if final file already exists (another worker might have completed the download)
         # This handles race conditions where multiple workers download the same file
-        if cache_path.exists() and cache_path.stat().st_size > 0:
-            # Another worker completed the download - finalize and return
+        if _is_nonempty_file(cache_path):
+            # Another worker completed the download - drop our copy, finalize and return
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
             return _finalize_cached_file(file_name, cache_path)
         
         if not tmp_path.exists():
             # Temp file doesn't exist - check if another worker completed it
-            if cache_path.exists() and cache_path.stat().st_size > 0:
+            if _is_nonempty_file(cache_path):
                 # Another worker completed it - finalize and return
                 return _finalize_cached_file(file_name, cache_path)
             # Temp file missing and final file doesn't exist - this is an error
@@ -749,7 +1101,7 @@ def _ensure_cached(file_name: str) -> Path:
                 tmp_size = tmp_path.stat().st_size
             except FileNotFoundError:
                 # Temp file was deleted - check if another worker completed the download
-                if cache_path.exists() and cache_path.stat().st_size > 0:
+                if _is_nonempty_file(cache_path):
                     # Another worker completed it - finalize and return
                     return _finalize_cached_file(file_name, cache_path)
                 # Temp file deleted and final file doesn't exist - error
@@ -758,18 +1110,23 @@ def _ensure_cached(file_name: str) -> Path:
             if tmp_size == 0:
                 raise IOError(f"Download failed: temp file {file_name} is empty before rename")
             
-            # Perform rename atomically
-            os.replace(tmp_path, cache_path)
+            # Publish atomically (keeps a peer's already-published copy if there is one)
+            # Count only files this process added (a kept peer copy is already counted/scanned)
+            if _atomic_publish(tmp_path, cache_path) and file_name != 'worldelev.npy':
+                with _CACHE_LOCK:
+                    _cached_count += 1
             
-            # Verify final file exists and is not empty
-            if not cache_path.exists():
+            # Verify final file exists and is not empty (single stat)
+            try:
+                final_size = os.stat(cache_path).st_size
+            except FileNotFoundError:
                 raise IOError(f"Downloaded file {file_name} is missing after rename (temp file was {tmp_size} bytes)")
             
-            if cache_path.stat().st_size == 0:
+            if final_size == 0:
                 raise IOError(f"Downloaded file {file_name} is empty after rename (temp file was {tmp_size} bytes)")
             
-            if cache_path.stat().st_size != tmp_size:
-                raise IOError(f"Downloaded file {file_name} size mismatch after rename (expected {tmp_size} bytes, got {cache_path.stat().st_size} bytes)")
+            if final_size != tmp_size:
+                raise IOError(f"Downloaded file {file_name} size mismatch after rename (expected {tmp_size} bytes, got {final_size} bytes)")
         except FileNotFoundError as e:
             # Temp file was deleted between check and rename (race condition)
             error_msg = f"Download failed: temp file {tmp_path} not found during rename for {file_name}. This may indicate a race condition or premature cleanup."
@@ -802,7 +1159,7 @@ def _ensure_cached(file_name: str) -> Path:
         
         # CRITICAL: Always remove from downloading set, even on error
         # This ensures the set doesn't grow unbounded with failed download attempts
-        with _downloading_lock:
+        with _CACHE_LOCK:
             _downloading_files.discard(file_name)
         
         # Always release download semaphore, even on error
@@ -825,7 +1182,8 @@ def upload_gefs(file_path: Path, file_name: str) -> bool:
             str(file_path),
             _BUCKET,
             file_name,
-            ExtraArgs={'ContentType': 'application/octet-stream'}
+            ExtraArgs={'ContentType': 'application/octet-stream'},
+            Config=_TRANSFER_CONFIG,  # Same parallel multipart + 4MB io_chunksize as downloads
         )
         return True
     except Exception as e:
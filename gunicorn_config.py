@@ -10,12 +10,27 @@ ARCHITECTURE: Multi-process + multi-threaded
 - Total: 32 concurrent request capacity
 - Each worker has separate simulator cache (not shared across processes)
 """
+import atexit
+import gc
+import logging.handlers
 import os
-import logging
+import queue
+import threading
+import time
+
+from gunicorn.glogging import Logger
+
+# Cap native math-library thread pools at one thread per request thread. Must be set before
+# NumPy is first imported (the config loads before the preloaded app); otherwise each worker
+# spins up a BLAS pool sized to every CPU, on top of its 8 request threads
+for _var in ('OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'OMP_NUM_THREADS'):
+    os.environ.setdefault(_var, '1')
 
 # Network binding
 bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"  # Bind to all interfaces, use PORT env var or default 8000
 backlog = 512  # Maximum pending connections (queue size before rejecting)
+# NOTE: the kernel caps this at net.core.somaxconn (container-level sysctl, not settable here)
+# gunicorn already sets TCP_NODELAY on its TCP listeners (inherited by accepted sockets)
 
 # Worker configuration
 workers = 4  # 4 worker processes for parallel request handling
@@ -25,15 +40,25 @@ worker_class = 'gthread'  # Thread-based workers (better for I/O-bound operation
 threads = 8  # 8 threads per worker (4 workers × 8 threads = 32 concurrent capacity)
 worker_connections = 200  # Maximum simultaneous clients per worker (rarely reached)
 
+# Worker heartbeat files live in RAM: gunicorn touches them on every notify, and on a
+# slow/overlay container disk those writes can stall workers and trip the timeout
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
 # Worker lifecycle
-max_requests = 800  # Restart worker after handling this many requests (prevents memory leaks)
-# Jitter randomizes restart timing to avoid thundering herd (all workers restarting at once)
-max_requests_jitter = 80  # Randomize restart: 800 ± 80 requests
+# Request-count recycling disabled: every restart throws away a warm simulator cache that
+# takes minutes to rebuild. Workers are recycled on memory instead (see post_fork watchdog)
+max_requests = 0
+worker_rss_mb_limit = int(os.getenv('WORKER_RSS_MB_LIMIT', '2048'))  # Private (anonymous) RSS per worker
 
 # Timeouts
 timeout = 900  # 15 minutes - ensemble simulations can take 5-15 minutes
 # Must be longer than longest expected ensemble run (10 minutes + buffer)
-keepalive = 30  # Keep connections alive for 30 seconds (reduces connection overhead)
+# Keep idle connections open longer than the edge proxy's ~60s idle timeout, so the proxy
+# always closes first; otherwise it can reuse a socket just as we close it (RST -> 502)
+# gthread parks idle keep-alive connections in its poller, not on a thread, so this
+# doesn't eat into the 8 threads; worker_connections caps how many are held per worker
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '75'))
 
 # Application loading
 preload_app = True  # Load app before forking workers (faster startup, shared memory for code)
@@ -45,41 +70,146 @@ reuse_port = True  # Enable SO_REUSEPORT for better load distribution across wor
 accesslog = '-'  # Log to stdout (Railway captures this)
 errorlog = '-'  # Log errors to stdout
 loglevel = 'warning'  # Only log warnings and errors (reduces log noise)
-access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
+# Host, request line, status, duration (us); ident/user/referer/agent are nearly always "-"
+# and Railway timestamps each stdout line itself
+access_log_format = '%(h)s "%(r)s" %(s)s %(D)s'
 
 proc_name = 'habsim'  # Process name for system monitoring
 
+class QuietStatusLogger(Logger):
+    """Gunicorn logger that skips access logging for /sim/status (polled every 5s, creates log spam).
+    
+    Returns before gunicorn builds the access-log atoms, formats the line or creates a
+    LogRecord, so the suppressed polls cost a single startswith() on the request path.
+    """
+    def access(self, resp, req, environ, request_time):
+        if req.path.startswith('/sim/status'):
+            return
+        super().access(resp, req, environ, request_time)
+
+logger_class = QuietStatusLogger
+
+def _anon_rss_mb():
+    """Private anonymous RSS of this process in MB, or None if unavailable.
+    
+    Excludes file-backed pages (the mmapped GEFS/elevation cache), which are shared
+    across workers and would otherwise dominate RSS without being a leak.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def _start_memory_watchdog(worker):
+    """Gracefully recycle this worker once its private RSS exceeds worker_rss_mb_limit."""
+    def _watch():
+        while worker.alive:
+            time.sleep(60)
+            rss_mb = _anon_rss_mb()
+            if rss_mb is None:
+                return  # No /proc (non-Linux) - nothing to watch
+            if rss_mb > worker_rss_mb_limit:
+                worker.log.warning("[WORKER %s] RSS %.0fMB > %sMB, recycling worker", worker.pid, rss_mb, worker_rss_mb_limit)
+                # Same graceful exit gunicorn uses for max_requests: stop accepting,
+                # finish in-flight requests, then the master spawns a replacement
+                worker.alive = False
+                return
+    threading.Thread(target=_watch, daemon=True, name=f"MemoryWatchdog-{worker.pid}").start()
+
+def _start_access_log_listener(server):
+    """Write this worker's access log from a background thread.
+    
+    Request threads only enqueue the record; the stdout write (which can block when the log
+    collector applies backpressure) happens on a single QueueListener thread. Started per
+    worker: an in-process queue doesn't cross fork, so a master-side listener would never
+    see worker records.
+    """
+    access_log = server.log.access_log
+    handlers = access_log.handlers[:]
+    if not handlers:
+        return  # Access logging disabled
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        access_log.removeHandler(handler)
+    access_log.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued lines on graceful worker exit
+
+def when_ready(server):
+    """
+    Prepare the preloaded master for forking workers.
+    
+    With preload_app=True, app.py (Flask, NumPy, simulate, gefs, habsim) is already imported
+    here, before any worker is forked. Freezing those objects into the GC's permanent
+    generation means worker collections never traverse them (and never write to their
+    pages), so they stay copy-on-write shared across all workers instead of becoming
+    private copies after the first full GC.
+    """
+    gc.collect()  # Don't freeze garbage
+    gc.freeze()
+
+def pre_fork(server, worker):
+    """
+    Assign the worker about to be forked a CPU slot (runs in the master).
+    
+    Takes the lowest slot no live worker holds, so a replacement for a recycled worker
+    (memory watchdog, timeout) gets the slice its predecessor freed rather than one a
+    live worker is still pinned to. The slot is recorded on the worker object here,
+    where the master keeps it in server.WORKERS; post_fork pins to it in the child.
+    """
+    taken = {getattr(w, 'cpu_slot', None) for w in server.WORKERS.values()}
+    worker.cpu_slot = next(slot for slot in range(len(taken) + 1) if slot not in taken)
+
 def post_fork(server, worker):
     """
     Initialize each worker process after forking.
     
     CRITICAL: Each worker needs its own cache trim thread since they have separate
-    memory spaces (Gunicorn uses processes, not just threads). The flag is reset
-    so each worker starts its own thread (prevents conflicts from preload_app=True).
+    memory spaces (Gunicorn uses processes, not just threads). simulate resets its
+    started flag in an os.register_at_fork hook, so the master's thread (preload_app=True)
+    doesn't stop each worker from starting its own.
     
-    Also sets up access log filtering to suppress /sim/status requests (polled every 5s).
+    Also starts the worker's access-log writer and memory watchdog, and warms its
+    storage connection pools.
+    (/sim/status access-log suppression is handled by QuietStatusLogger.)
     """
-    # Set up access log filtering for this worker
-    # Suppresses /sim/status logs (polled every 5s, creates log spam)
-    class StatusLogFilter(logging.Filter):
-        def filter(self, record):
-            return '/sim/status' not in record.getMessage()
+    # Start this worker's cache trim thread (simulate's at-fork hook has already cleared
+    # the master's started flag, so this starts exactly one thread per worker)
+    try:
+        import simulate
+        simulate._start_cache_trim_thread()
+        server.log.info("[WORKER %s] Cache trim thread started in post_fork", worker.pid)
+    except Exception as e:
+        server.log.error("[WORKER %s] Failed to start cache trim thread: %s", worker.pid, e)
     
-    access_logger = logging.getLogger('gunicorn.access')
-    access_logger.addFilter(StatusLogFilter())
+    # Pin this worker to its own slice of CPUs so the scheduler doesn't migrate its threads
+    # (and their cache-hot wind data) across cores/sockets. Slot assigned in pre_fork
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+        per_worker = len(cpus) // workers
+        slot = worker.cpu_slot
+        # Slots past `workers` only exist while old workers drain during a reload: unpinned
+        if per_worker >= 2 and slot < workers:  # Not worth splitting tiny machines
+            os.sched_setaffinity(0, cpus[slot * per_worker:(slot + 1) * per_worker])
+    except (AttributeError, OSError) as e:  # sched_* is Linux-only
+        server.log.warning("[WORKER %s] CPU pinning skipped: %s", worker.pid, e)
     
-    # CRITICAL: Reset cache trim thread flag and start thread for this worker
-    # With preload_app=True, module-level code runs in master process, so flag
-    # might already be True. We reset it so each worker starts its own thread.
+    # Move access-log I/O off the request threads
+    _start_access_log_listener(server)
+    
+    # Recycle this worker on memory growth instead of request count (max_requests = 0)
+    _start_memory_watchdog(worker)
+    
+    # Warm this worker's storage connection pools in the background so the first
+    # request after fork doesn't pay DNS + TCP + TLS setup
     try:
-        import simulate
-        was_already_started = simulate._cache_trim_thread_started
-        simulate._cache_trim_thread_started = False  # Reset flag for this worker
-        simulate._start_cache_trim_thread()  # Start thread in this worker process
-        if was_already_started:
-            print(f"[WORKER {worker.pid}] Cache trim thread restarted in post_fork", flush=True)
-        else:
-            print(f"[WORKER {worker.pid}] Cache trim thread started in post_fork", flush=True)
+        import gefs
+        gefs.warm_connections()
     except Exception as e:
-        print(f"[WORKER {worker.pid}] Failed to start cache trim thread: {e}", flush=True)
+        server.log.warning("[WORKER %s] Failed to warm storage connections: %s", worker.pid, e)
 
@@ -12,4 +12,4 @@ ElevationFile   Ground elevation data wrapper
 Trajectory      Container for trajectory points
 """
 
-from .classes import *
\ No newline at end of file
+from .classes import Trajectory, Record, Location, ElevationFile, Balloon, Simulator, distance
\ No newline at end of file
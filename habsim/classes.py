@@ -7,11 +7,17 @@ Location (geographic coordinates), Trajectory (path container), and ElevationFil
 """
 import math
 import numpy as np
+from collections import OrderedDict
 from windfile import WindFile
 from datetime import timedelta, datetime
 
+__all__ = ['Trajectory', 'Record', 'Location', 'ElevationFile', 'Balloon', 'Simulator', 'distance']
+
 # Earth radius in meters (used for coordinate transformations)
 EARTH_RADIUS = float(6.371e6)
+EARTH_RADIUS_KM = 6371.0  # Same radius in km (for distance calculations)
+_DEG_TO_RAD = math.pi / 180.0  # Same factor math.radians() applies (bit-identical results)
+_DEG_PER_METER = math.degrees(1.0) / EARTH_RADIUS  # Angle (deg) subtended by 1m of great circle
 
 def _rowcol_from_transform(rows, cols, lon, lat):
     """Convert lon/lat to row/col indices for global grid transform."""
@@ -31,14 +37,29 @@ class Trajectory(list):
         return (self.data[-1].time - self.data[0].time).total_seconds() / 3600
 
     def length(self):
-        """Distance travelled by trajectory in km."""
-        return sum(i.location.distance(j.location) for i, j in zip(self[:-1], self[1:]))
+        """Distance travelled by trajectory in km.
+        
+        Vectorized haversine over all consecutive point pairs (one NumPy pass instead of a
+        Python-level distance() call per pair).
+        """
+        if len(self) < 2:
+            return 0.0
+        coords = np.radians(np.array([r.location for r in self], dtype=np.float64))
+        lat, lon = coords[:, 0], coords[:, 1]
+        dlat = lat[1:] - lat[:-1]
+        dlon = lon[1:] - lon[:-1]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        return float(EARTH_RADIUS_KM * c.sum())
 
     def interpolate(self, time):
         """Interpolate position at given time. Not implemented."""
         pass
 
 class Record:
+    # Fixed fields: no per-instance __dict__ (one Record per simulation step)
+    __slots__ = ('time', 'location', 'alt', 'ascent_rate', 'air_vector', 'wind_vector', 'ground_elev')
+
     def __init__(self, time=None, location=None, alt=None, ascent_rate=None, air_vector=None, wind_vector=None, ground_elev=None):
         self.time = time
         self.location = location
@@ -48,14 +69,48 @@ class Record:
         self.wind_vector = wind_vector
         self.ground_elev = ground_elev
 
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Calculate great circle distance between two points using haversine formula.
+    
+    Returns distance in km. More accurate than simple Euclidean distance for
+    long distances because it accounts for Earth's curvature.
+    
+    Formula: a = sin²(Δlat/2) + cos(lat1) × cos(lat2) × sin²(Δlon/2)
+             c = 2 × asin(√a)  (equivalent to 2 × atan2(√a, √(1-a)), one sqrt fewer)
+             distance = R × c
+    
+    Segments under ~60km (both deltas < 0.01 rad, e.g. consecutive simulation steps)
+    use the equirectangular approximation c = hypot(Δlon × cos(mean lat), Δlat):
+    one transcendental instead of five, within ~2e-5 relative of the full formula.
+    """
+    # Convert degrees to radians (straight-line multiplies; no map()/list per call)
+    lat1 *= _DEG_TO_RAD
+    lat2 *= _DEG_TO_RAD
+    dlat = lat2 - lat1
+    dlon = (lon2 - lon1) * _DEG_TO_RAD
+    if -0.01 < dlat < 0.01 and -0.01 < dlon < 0.01:
+        return EARTH_RADIUS_KM * math.hypot(dlon * math.cos((lat1 + lat2) * 0.5), dlat)
+    # Haversine formula
+    a = math.sin(dlat/2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2) ** 2
+    c = 2 * math.asin(math.sqrt(min(a, 1.0)))  # min(): rounding can push a past 1 near antipodes
+    return EARTH_RADIUS_KM * c
+
+def distance(loc_a, loc_b):
+    """Great circle distance in km between two (lat, lon) locations."""
+    return haversine(loc_a[0], loc_a[1], loc_b[0], loc_b[1])
+
 class Location(tuple):
     """
     Geographic location as immutable tuple (lat, lon).
     
     Provides distance calculation using haversine formula for great circle
     distance (accounts for Earth's curvature, accurate for long distances).
+    
+    Kept for callers that want named accessors; the simulator itself stores plain
+    (lat, lon) tuples (no subclass allocation per step) and uses distance().
     """
-    EARTH_RADIUS = 6371.0  # Earth radius in km (for distance calculations)
+    EARTH_RADIUS = EARTH_RADIUS_KM  # Earth radius in km (for distance calculations)
 
     def __new__(cls, lat, lon):
         return tuple.__new__(cls, (lat, lon))
@@ -68,27 +123,11 @@ class Location(tuple):
 
     def distance(self, other):
         """Calculate great circle distance to another location in km."""
-        return self.haversine(self[0], self[1], other[0], other[1])
+        return distance(self, other)
 
     def haversine(self, lat1, lon1, lat2, lon2):
-        """
-        Calculate great circle distance between two points using haversine formula.
-        
-        Returns distance in km. More accurate than simple Euclidean distance for
-        long distances because it accounts for Earth's curvature.
-        
-        Formula: a = sin²(Δlat/2) + cos(lat1) × cos(lat2) × sin²(Δlon/2)
-                 c = 2 × atan2(√a, √(1-a))
-                 distance = R × c
-        """
-        # Convert degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        # Haversine formula
-        a = math.sin(dlat/2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return self.EARTH_RADIUS * c
+        """Great circle distance in km (see module-level haversine())."""
+        return haversine(lat1, lon1, lat2, lon2)
 
 class ElevationFile:
     """
@@ -106,45 +145,67 @@ class ElevationFile:
         self.MAX_LON = 179.99985967111152
         self.MAX_LAT = 83.99986041511133
         self.MIN_LAT = -90.0001388888889
+        # Grid constants for elev(): fixed per file, so computed once instead of per lookup
+        self._rows, self._cols = self.data.shape
+        self._col_scale = (self._cols - 1) / (self.MAX_LON - self.MIN_LON)
+        self._row_scale = (self._rows - 1) / (self.MAX_LAT - self.MIN_LAT)
 
     def elev(self, lat, lon):
         """
         Return bilinearly interpolated elevation for (lat, lon).
         
-        Performs bilinear interpolation on 2D elevation grid. Clips coordinates
-        to valid range and handles longitude wrap-around. Returns 0.0 on error.
+        Performs bilinear interpolation on 2D elevation grid. Clamps latitude
+        to valid range and handles longitude wrap-around; the clamps keep every
+        index in range, so there is no catch-all error path (a NaN coordinate
+        raises instead of silently reading as sea level).
         """
-        try:
-            rows, cols = self.data.shape
-            # Clip latitude to valid range (prevents out-of-bounds access)
-            lat = np.clip(lat, self.MIN_LAT, self.MAX_LAT)
-            # Normalize longitude to [-180, 180] range (handles wrap-around)
-            lon = ((lon + 180) % 360) - 180
-            
-            # Convert lat/lon to grid coordinates (floating-point indices)
-            col_f = (lon - self.MIN_LON) / (self.MAX_LON - self.MIN_LON) * (cols - 1)
-            row_f = (self.MAX_LAT - lat) / (self.MAX_LAT - self.MIN_LAT) * (rows - 1)
-            
-            # Get integer indices of 2×2 grid cell surrounding target point
-            x0, y0 = int(np.floor(col_f)), int(np.floor(row_f))
-            x1, y1 = min(x0 + 1, cols - 1), min(y0 + 1, rows - 1)  # Clamp to grid bounds
-            # Fractional parts for interpolation weights
-            fx, fy = col_f - x0, row_f - y0
-            
-            # Extract 4 corner values of grid cell
-            v00, v10 = self.data[y0, x0], self.data[y0, x1]  # Top row
-            v01, v11 = self.data[y1, x0], self.data[y1, x1]  # Bottom row
-            
-            # Bilinear interpolation: interpolate horizontally first, then vertically
-            v_top = v00 * (1 - fx) + v10 * fx      # Interpolate top row
-            v_bottom = v01 * (1 - fx) + v11 * fx   # Interpolate bottom row
-            elev = v_top * (1 - fy) + v_bottom * fy  # Interpolate vertically
-            
-            # Return non-negative elevation (ocean/sea level is 0)
-            return float(max(0, elev))
-        except Exception:
-            # Return 0.0 on any error (safe fallback - simulation continues)
-            return 0.0
+        row_f, col_f = self.grid_position(lat, lon)
+        # Get integer indices of 2×2 grid cell surrounding target point
+        # (clamped: float rounding at the grid edges must not step outside the array)
+        x0 = min(max(math.floor(col_f), 0), self._cols - 1)
+        y0 = min(max(math.floor(row_f), 0), self._rows - 1)
+        return self.interpolate_cell(self.cell_corners(y0, x0), col_f - x0, row_f - y0)
+
+    def grid_position(self, lat, lon):
+        """Fractional (row, col) grid coordinates of (lat, lon), clamped/wrapped into the grid."""
+        # Clamp latitude to valid range (prevents out-of-bounds access)
+        if lat < self.MIN_LAT:
+            lat = self.MIN_LAT
+        elif lat > self.MAX_LAT:
+            lat = self.MAX_LAT
+        # Normalize longitude to [-180, 180) range (handles wrap-around)
+        # Already-normalized input (the common case) skips the arithmetic entirely
+        if not -180.0 <= lon < 180.0:
+            lon = math.fmod(lon + 180.0, 360.0)
+            if lon < 0:
+                lon += 360.0
+            lon -= 180.0
+        # Convert lat/lon to grid coordinates (floating-point indices)
+        return (self.MAX_LAT - lat) * self._row_scale, (lon - self.MIN_LON) * self._col_scale
+
+    def cell_corners(self, y0, x0):
+        """The 4 corner elevations (v00, v10, v01, v11) of grid cell (y0, x0) as floats."""
+        x1, y1 = min(x0 + 1, self._cols - 1), min(y0 + 1, self._rows - 1)  # Clamp to grid bounds
+        data = self.data
+        return (float(data[y0, x0]), float(data[y0, x1]),  # Top row
+                float(data[y1, x0]), float(data[y1, x1]))  # Bottom row
+
+    @staticmethod
+    def interpolate_cell(corners, fx, fy):
+        """Bilinear interpolation within a cell (fx, fy are the fractional offsets)."""
+        v00, v10, v01, v11 = corners
+        # Interpolate horizontally first, then vertically
+        v_top = v00 * (1 - fx) + v10 * fx      # Interpolate top row
+        v_bottom = v01 * (1 - fx) + v11 * fx   # Interpolate bottom row
+        elev = v_top * (1 - fy) + v_bottom * fy  # Interpolate vertically
+        # Return non-negative elevation (ocean/sea level is 0)
+        return max(0.0, elev)
+
+def _as_vector(vector):
+    """(u, v) as a plain float tuple; tuples (e.g. the (0,0) default) are stored as-is."""
+    if vector is None or type(vector) is tuple:
+        return vector
+    return (float(vector[0]), float(vector[1]))
 
 class Balloon:
     """
@@ -153,37 +214,47 @@ class Balloon:
     Uses history-based state: current state is always the last Record in history.
     This allows tracking full trajectory while maintaining simple attribute access
     (balloon.alt, balloon.location, etc. always refer to current state).
+    
+    The current Record is also held in _current (kept in sync by update() and by
+    assigning history), so delegated attribute access is a direct lookup rather than
+    a history[-1] index per access. Extend history through update(), not append().
     """
     def __init__(self, time=None, location=None, alt=0, ascent_rate=0, air_vector=(0,0), wind_vector=None, ground_elev=None):
         # Create initial state record
         record = Record(
             time=time,
-            location=Location(*location) if location else None,
+            location=tuple(location) if location else None,  # Plain (lat, lon) tuple
             alt=alt,
             ascent_rate=ascent_rate,
-            air_vector=np.array(air_vector) if air_vector is not None else None,
-            wind_vector=np.array(wind_vector) if wind_vector is not None else None,
+            air_vector=_as_vector(air_vector),
+            wind_vector=wind_vector,
             ground_elev=ground_elev
         )
         self.history = Trajectory([record])
 
-    def update(self, time=None, location=None, alt=0, ascent_rate=0, air_vector=(0,0), wind_vector=None, ground_elev=None):
+    def update(self, time=None, location=None, alt=None, ascent_rate=0, air_vector=(0,0), wind_vector=None, ground_elev=None):
         """
         Add new state record to trajectory history.
         
         Uses current values as defaults (allows partial updates). New record becomes
         the current state (accessible via balloon.alt, balloon.location, etc.).
+        
+        No per-step ndarray copies: air_vector is kept as a (u, v) tuple and wind_vector
+        is stored as given (WindFile.get returns a fresh array on every call).
         """
+        current = self._current
         record = Record(
-            time=time or self.time,
-            location=Location(*location) if location else self.location,
-            alt=alt or self.alt,
-            ascent_rate=ascent_rate or self.ascent_rate,
-            air_vector=np.array(air_vector) if air_vector is not None else self.air_vector,
-            wind_vector=np.array(wind_vector) if wind_vector is not None else self.wind_vector,
-            ground_elev=ground_elev or self.ground_elev
+            time=time or current.time,
+            location=location if location else current.location,  # (lat, lon) tuple
+            alt=alt if alt is not None else current.alt,  # 0.0 (sea level) is a real altitude
+            ascent_rate=ascent_rate or current.ascent_rate,
+            air_vector=_as_vector(air_vector) if air_vector is not None else current.air_vector,
+            wind_vector=wind_vector if wind_vector is not None else current.wind_vector,
+            # 0.0 (sea level) is a real elevation, not "unchanged"
+            ground_elev=ground_elev if ground_elev is not None else current.ground_elev
         )
         self.history.append(record)
+        object.__setattr__(self, '_current', record)
     
     def __getattr__(self, name):
         """
@@ -192,9 +263,10 @@ class Balloon:
         This allows balloon.alt, balloon.location, etc. to work naturally
         while state is actually stored in history list.
         """
-        if name == "history":
-            return super().__getattr__(name)
-        return self.history[-1].__getattribute__(name)
+        if name in ("history", "_current"):
+            # Only reached before __init__ has set them (e.g. during copy/unpickling)
+            raise AttributeError(name)
+        return getattr(self._current, name)
 
     def __setattr__(self, name, value):
         """
@@ -202,10 +274,11 @@ class Balloon:
         
         Setting balloon.alt = 1000 actually updates self.history[-1].alt.
         """
-        if name != "history":
-            self.history[-1].__setattr__(name, value)
-        else:
+        if name == "history":
             super().__setattr__(name, value)
+            super().__setattr__('_current', value[-1])
+        else:
+            setattr(self._current, name, value)
 
 class Simulator:
     """
@@ -222,115 +295,208 @@ class Simulator:
         else:
             self.elev_file = ElevationFile(elev_file)
         self.wind_file = wind_file
-        # Cache for elevation lookups (rounded to 4 decimal places ≈ 11m precision)
-        # Reduces redundant elevation calculations during simulation
-        self._elev_cache = {}
+        # Cache of DEM grid cells (4 corner elevations each) keyed by cell index, so
+        # lookups anywhere in a cell hit and still interpolate at the exact position
+        # LRU (OrderedDict) so the cells around the current descent stay cached at the limit
+        # (~1MB per Simulator at the limit; up to 30 Simulators are cached in ensemble mode)
+        self._elev_cache = OrderedDict()
+        self._elev_cache_max_size = 4096
     
-    def _cached_elev(self, lat_rounded, lon_rounded):
+    def _cached_elev(self, lat, lon):
         """
-        Cached elevation lookup with rounded coordinates.
+        Elevation at (lat, lon) with the surrounding DEM cell cached.
         
-        Rounds coordinates to 4 decimal places (≈11m precision) to increase
-        cache hit rate. Elevation doesn't change significantly over 11m.
+        Caches the cell's 4 corner values rather than the interpolated result, keyed by
+        the integer cell index (one int, no rounding or float hashing), so every point
+        in a cell (~1.8km across) shares an entry and the result equals elev() exactly.
+        Evicts least recently used cells one at a time once full.
         """
-        cache_key = (lat_rounded, lon_rounded)
-        if cache_key not in self._elev_cache:
-            if len(self._elev_cache) >= 1000:  # Limit cache size
-                self._elev_cache.clear()  # Simple eviction (FIFO)
-            self._elev_cache[cache_key] = self.elev_file.elev(lat_rounded, lon_rounded)
-        return self._elev_cache[cache_key]
+        elev_file = self.elev_file
+        row_f, col_f = elev_file.grid_position(lat, lon)
+        x0 = min(max(math.floor(col_f), 0), elev_file._cols - 1)
+        y0 = min(max(math.floor(row_f), 0), elev_file._rows - 1)
+        cache_key = y0 * elev_file._cols + x0
+        cache = self._elev_cache
+        # Simulators are shared across request threads: each OrderedDict operation is atomic,
+        # but another thread may evict our key between them, so treat that as a miss
+        try:
+            corners = cache[cache_key]
+            cache.move_to_end(cache_key)
+        except KeyError:
+            corners = elev_file.cell_corners(y0, x0)
+            cache[cache_key] = corners
+            if len(cache) > self._elev_cache_max_size:
+                try:
+                    cache.popitem(last=False)  # Least recently used
+                except KeyError:
+                    pass
+        return elev_file.interpolate_cell(corners, col_f - x0, row_f - y0)
 
-    def step(self, balloon, step_size: float, coefficient):
+    def _advance(self, balloon, step_size, coefficient, wind_get):
         """
-        Runge-Kutta 2nd order (RK2) integrator for one simulation step.
-        
-        RK2 method: evaluates derivative at start (k1) and midpoint (k2), then
-        uses k2 to advance state. More accurate than Euler method for same step size.
-        
-        Args:
-            balloon: Balloon object (state is updated in-place)
-            step_size: Time step in seconds
-            coefficient: Floating coefficient (scales horizontal wind effect)
+        RK2 state after step_size seconds from the balloon's current state.
         
-        Returns:
-            New Record object with updated state
+        Does not modify the balloon, so callers can also evaluate trial steps
+        (see _time_to_ground). k1 uses balloon.wind_vector when it is set (step()
+        samples it at the end of every step, i.e. at the current state), so each
+        call costs one wind lookup. Returns (lat, lon, alt, epoch_seconds).
         """
-        if self.wind_file is None:
-            raise RuntimeError("Simulator wind_file is None - simulator was cleaned up during use")
-        
-        # Initialize ground elevation on first step
-        if not balloon.ground_elev:
-            balloon.ground_elev = self.elev_file.elev(*balloon.location)
-            balloon.alt = max(balloon.alt, balloon.ground_elev)  # Ensure altitude >= ground
-        
-        # Get wind vector if not already cached
-        if balloon.wind_vector is None:
-            balloon.wind_vector = self.wind_file.get(*balloon.location, balloon.alt, balloon.time)
-
-        # Current state
-        lat0 = balloon.location.getLat()
-        lon0 = balloon.location.getLon()
-        alt0 = balloon.alt
-        t0 = balloon.time
-        asc = balloon.ascent_rate
+        # Current state (read from the current Record directly: each balloon.<field>
+        # read would be a __getattr__ call)
+        current = balloon._current
+        lat0, lon0 = current.location
+        alt0 = current.alt
+        t0 = current.time
+        # Wind lookups take epoch seconds; convert once and do the RK2 time arithmetic as
+        # float adds (step() builds the record's datetime)
+        t0s = t0.timestamp()
+        asc = current.ascent_rate
         h = float(step_size)
 
-        def sample_rates(lat, lon, alt, t):
+        # Per-step invariants, resolved once instead of inside every sample_rates() call
+        # (wind_get is resolved by the caller, which pins the WindFile for the whole step so
+        # a concurrent cleanup can't swap it to None between samples)
+        air_vector = current.air_vector
+        if air_vector is not None:
+            air_u, air_v = float(air_vector[0]), float(air_vector[1])
+        else:
+            air_u = air_v = 0.0
+        # m/s -> deg/s factor with the floating coefficient folded in (one multiply per axis)
+        scale = _DEG_PER_METER * coefficient
+
+        def sample_rates(lat, temp):
             """
-            Sample rate of change (derivative) at given position/time.
+            Rate of change (derivative) for wind sample temp at latitude lat.
             
             Returns (dlat_dt, dlon_dt, dalt_dt) - angular velocities in deg/s
             and vertical velocity in m/s.
             """
-            if self.wind_file is None:
-                raise RuntimeError("Simulator wind_file is None - simulator was cleaned up during use")
-            # Get wind vector at this position/time
-            temp = self.wind_file.get(lat, lon, alt, t)
-            u, v = float(temp[0]), float(temp[1])  # u = eastward, v = northward
-            # Add air vector if present (balloon's own motion relative to wind)
-            if balloon.air_vector is not None:
-                u += float(balloon.air_vector[0])
-                v += float(balloon.air_vector[1])
-            # Convert linear velocities (m/s) to angular velocities (deg/s)
-            dlat_dt, dlon_dt = self.lin_to_angular_velocities(lat, lon, u, v)
-            # Apply floating coefficient (scales horizontal wind effect)
-            dlat_dt *= coefficient
-            dlon_dt *= coefficient
-            return dlat_dt, dlon_dt, asc  # asc is already in m/s
+            # u = eastward, v = northward, plus the balloon's own motion relative to wind
+            u = float(temp[0]) + air_u
+            v = float(temp[1]) + air_v
+            # Convert linear velocities (m/s) to angular velocities (deg/s), scaled by the
+            # floating coefficient. Inlined lin_to_angular_velocities(): one cos per sample,
+            # no method call or math.radians() call (the latitude differs at k1/k2, so the cos
+            # can't be shared without dropping the integrator's accuracy)
+            return v * scale, u * scale / math.cos(lat * _DEG_TO_RAD), asc  # asc is already in m/s
 
         # RK2 Step 1: Evaluate derivative at start (k1)
-        k1_lat, k1_lon, k1_alt = sample_rates(lat0, lon0, alt0, t0)
+        wind0 = current.wind_vector
+        if wind0 is None:
+            wind0 = wind_get(lat0, lon0, alt0, t0s)
+        k1_lat, k1_lon, k1_alt = sample_rates(lat0, wind0)
         
         # RK2 Step 2: Evaluate derivative at midpoint (k2)
         # Midpoint is calculated using k1: state_mid = state0 + 0.5 * h * k1
         lat_mid = lat0 + 0.5 * h * k1_lat
         lon_mid = lon0 + 0.5 * h * k1_lon
         alt_mid = alt0 + 0.5 * h * k1_alt
-        t_mid = t0 + timedelta(seconds=0.5 * h)
+        t_mid = t0s + 0.5 * h
         
-        k2_lat, k2_lon, k2_alt = sample_rates(lat_mid, lon_mid, alt_mid, t_mid)
+        k2_lat, k2_lon, k2_alt = sample_rates(lat_mid, wind_get(lat_mid, lon_mid, alt_mid, t_mid))
         
         # RK2 Step 3: Advance state using k2 (more accurate than using k1)
         # new_state = old_state + h * k2
         newLat = lat0 + h * k2_lat
         newLon = lon0 + h * k2_lon
         newAlt = alt0 + h * k2_alt
-        newTime = t0 + timedelta(seconds=h)
-        newLoc = (newLat, newLon)
+        return newLat, newLon, newAlt, t0s + h
 
-        # Get wind vector at new position (for next step)
+    def _time_to_ground(self, balloon, max_step, coefficient):
+        """
+        Step size (s) at which the balloon's RK2 path meets the ground within max_step.
+        
+        Root-finds f(t) = alt(t) - ground(lat(t), lon(t)) along the actual (wind-driven)
+        path with Illinois regula falsi, so the final approach takes one step instead of a
+        series of linear-estimate steps clamped at 0.1s. Returns the bracket end at/below
+        ground (within 0.5m when converged), so the step it sizes lands and the caller's
+        ground check ends the flight; returns max_step if the path clears the terrain.
+        """
+        if self.wind_file is None:
+            raise RuntimeError("Simulator wind_file is None - simulator was cleaned up during use")
+        wind_get = self.wind_file.get
+        current = balloon._current
+        lat, lon = current.location
+        lo, f_lo = 0.0, current.alt - self._cached_elev(lat, lon)
+        if f_lo <= 0:
+            return 0.1  # Already at/below ground (minimum step, as before)
+        hi = float(max_step)
+        lat, lon, alt, _ = self._advance(balloon, hi, coefficient, wind_get)
+        f_hi = alt - self._cached_elev(lat, lon)
+        if f_hi > 0:
+            return hi  # Terrain falls away along the path: the full step stays airborne
+        # Secant weights; halved on the stagnant end (Illinois) so both ends converge
+        g_lo, g_hi = f_lo, f_hi
+        last = 0
+        for _ in range(6):
+            if f_hi > -0.5 or hi - lo < 0.1:
+                break
+            t = hi - g_hi * (hi - lo) / (g_hi - g_lo)
+            lat, lon, alt, _ = self._advance(balloon, t, coefficient, wind_get)
+            f = alt - self._cached_elev(lat, lon)
+            if f <= 0:
+                hi, f_hi, g_hi = t, f, f
+                if last < 0:
+                    g_lo *= 0.5
+                last = -1
+            else:
+                lo, g_lo = t, f
+                if last > 0:
+                    g_hi *= 0.5
+                last = 1
+        # Minimum step size to avoid numerical issues (very small steps cause errors)
+        return max(hi, 0.1)
+
+    def step(self, balloon, step_size: float, coefficient):
+        """
+        Runge-Kutta 2nd order (RK2) integrator for one simulation step.
+        
+        RK2 method: evaluates derivative at start (k1) and midpoint (k2), then
+        uses k2 to advance state. More accurate than Euler method for same step size.
+        
+        Args:
+            balloon: Balloon object (state is updated in-place)
+            step_size: Time step in seconds
+            coefficient: Floating coefficient (scales horizontal wind effect)
+        
+        Returns:
+            New Record object with updated state
+        """
         if self.wind_file is None:
             raise RuntimeError("Simulator wind_file is None - simulator was cleaned up during use")
-        wind_vector = self.wind_file.get(*newLoc, newAlt, newTime)
+        
+        # Initialize ground elevation on first step
+        # State is read/written on the current Record directly rather than through
+        # Balloon's __getattr__/__setattr__ delegation (a Python call per access)
+        current = balloon._current
+        if current.ground_elev is None:
+            current.ground_elev = self.elev_file.elev(*current.location)
+            if current.alt < current.ground_elev:
+                current.alt = current.ground_elev  # Ensure altitude >= ground
+                current.wind_vector = None  # Sampled below ground; refetch at the new alt
+        
+        wind_get = self.wind_file.get  # Pins the WindFile for this step (see _advance)
+
+        # The launch record still needs its wind vector (it is part of the output path);
+        # it is also k1's sample, which _advance takes from balloon.wind_vector
+        if current.wind_vector is None:
+            current.wind_vector = wind_get(*current.location, current.alt, current.time)
+
+        newLat, newLon, newAlt, new_ts = self._advance(balloon, step_size, coefficient, wind_get)
+        newTime = current.time + timedelta(seconds=float(step_size))
+        newLoc = (newLat, newLon)
+
+        # Get wind vector at new position (for next step)
+        wind_vector = wind_get(newLat, newLon, newAlt, new_ts)
         
         # OPTIMIZATION: Only compute elevation if near ground or first step
         # When high altitude (>1000m above ground), elevation doesn't change much
         # This avoids expensive elevation lookups during most of the flight
-        if newAlt < (balloon.ground_elev or 0) + 1000 or not balloon.ground_elev:
-            # Use cached elevation lookup with rounded coordinates (reduces redundant calculations)
-            ground_elev = self._cached_elev(round(newLat, 4), round(newLon, 4))
+        if newAlt < current.ground_elev + 1000:
+            # Cached DEM cell lookup (reuses the cell while the balloon stays within it)
+            ground_elev = self._cached_elev(newLat, newLon)
         else:
-            ground_elev = balloon.ground_elev  # Reuse existing elevation (high altitude)
+            ground_elev = current.ground_elev  # Reuse existing elevation (high altitude)
         
         # Update balloon state with new position
         balloon.update(
@@ -340,7 +506,7 @@ class Simulator:
             time=newTime,
             alt=newAlt,
         )
-        return balloon.history[-1]
+        return balloon._current
     
     def lin_to_angular_velocities(self, lat, lon, u, v):
         """
@@ -354,8 +520,8 @@ class Simulator:
             dlat/dt = v / R (degrees per second)
             dlon/dt = u / (R * cos(lat)) (degrees per second)
         """
-        dlat = math.degrees(v / EARTH_RADIUS)
-        dlon = math.degrees(u / (EARTH_RADIUS * math.cos(math.radians(lat))))
+        dlat = v * _DEG_PER_METER
+        dlon = u * _DEG_PER_METER / math.cos(lat * _DEG_TO_RAD)
         return dlat, dlon
 
     def simulate(self, balloon, step_size, coefficient, elevation, target_alt=None, dur=None):
@@ -397,46 +563,57 @@ class Simulator:
             step_history.append(self.step(balloon, 0, coefficient))
             return step_history
         
-        end_time = balloon.time + timedelta(hours=dur)
+        # Loop bookkeeping in float epoch seconds (no timedelta arithmetic per iteration)
+        t = balloon.time.timestamp()
+        end_t = t + dur * 3600
         
         # Main simulation loop: step until end_time or ground is hit
-        while (end_time - balloon.time).total_seconds() > 1:
+        while end_t - t > 1:
             # Calculate step size (may be reduced if hitting end_time or ground)
             current_step_size = step_size
             
             # Reduce step size if next step would exceed end_time
             # This ensures we stop exactly at end_time, not overshoot
-            if balloon.time + timedelta(seconds=step_size) >= end_time:
-                current_step_size = (end_time - balloon.time).seconds
+            if t + step_size >= end_t:
+                current_step_size = int(end_t - t)  # Whole seconds, as before
             
             # GROUND COLLISION DETECTION: If descending, check if we'll hit ground
             # This prevents balloon from going underground (physically impossible)
-            if elevation and balloon.ascent_rate < 0:  # Descending (negative ascent_rate)
-                current_ground_elev = self.elev_file.elev(*balloon.location)
+            current = balloon._current  # Direct Record reads (no __getattr__ per access)
+            if elevation and current.ascent_rate < 0:  # Descending (negative ascent_rate)
+                # Ground under the balloon now, via the DEM cell cache (_time_to_ground() and
+                # the step's own ground refresh usually hit the same cell)
+                current_ground_elev = self._cached_elev(*current.location)
+                if current.ground_elev is not None:
+                    # Also refresh the stored value: step() only re-reads the ground within
+                    # 1000m of the last known ground_elev, which goes stale while the balloon
+                    # is high (e.g. launch at sea level, descent onto a plateau)
+                    current.ground_elev = current_ground_elev
                 # Estimate altitude after full step (simple linear estimate)
-                # More accurate than RK2 for this check (faster, sufficient accuracy)
-                estimated_alt_after = balloon.alt + balloon.ascent_rate * current_step_size
+                # Cheap screen: only the final approach pays for the root-find below
+                estimated_alt_after = current.alt + current.ascent_rate * current_step_size
                 
-                # If we would go below ground, calculate exact time to reach ground
+                # If we would go below ground, find when the actual RK2 path meets the
+                # ground (accounts for terrain along the wind-driven horizontal motion)
                 if estimated_alt_after < current_ground_elev:
-                    # Calculate time to reach ground: distance / descent_rate
-                    # descent_rate is negative, so we need absolute value
-                    time_to_ground = (balloon.alt - current_ground_elev) / abs(balloon.ascent_rate)
-                    # Use smaller of: time to ground or remaining step time
-                    # This ensures we stop exactly at ground, not overshoot
-                    current_step_size = min(time_to_ground, current_step_size)
-                    # Minimum step size to avoid numerical issues (very small steps cause errors)
-                    if current_step_size < 0.1:
-                        current_step_size = 0.1
+                    current_step_size = self._time_to_ground(balloon, current_step_size, coefficient)
             
             # Perform one RK2 integration step
             newRecord = self.step(balloon, current_step_size, coefficient)
             step_history.append(newRecord)
+            t = newRecord.time.timestamp()  # Re-derive from the record (no float drift)
             
             # GROUND COLLISION CHECK: Break if balloon hits the ground
             # Check after step to catch any overshoot (RK2 might slightly overshoot)
-            if elevation and balloon.alt <= self.elev_file.elev(*balloon.location):
-                break
+            if elevation:
+                # Fresh ground under the new position, not step()'s stored value: step() only
+                # re-reads it within 1000m of the last known ground, so a level or rising phase
+                # could fly through terrain rising toward it. Same cached lookup that
+                # _time_to_ground() lands against (usually a hit on the step's own cell)
+                ground_elev = self._cached_elev(*newRecord.location)
+                newRecord.ground_elev = ground_elev
+                if newRecord.alt <= ground_elev:
+                    break
         
         return step_history
 
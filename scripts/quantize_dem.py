@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Quantize the elevation grid (worldelev.npy) to int16 meters.
+
+Elevations fit in int16 (-32768..32767 m) at 1m resolution, well within the
+source DEM's own accuracy, and half the size of float32: every bilinear lookup
+touches half the bytes and the memory map needs half the page cache.
+ElevationFile and elev.py read either dtype (corner values are converted to
+float before interpolating), so the output is a drop-in replacement.
+
+Usage: python scripts/quantize_dem.py worldelev.npy worldelev_int16.npy
+"""
+import sys
+import argparse
+
+import numpy as np
+
+INT16_MIN, INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+CHUNK_ROWS = 1024  # Rows converted per pass (keeps peak memory small)
+
+parser = argparse.ArgumentParser(description="Quantize worldelev.npy to int16 meters")
+parser.add_argument("src", help="Input .npy elevation grid")
+parser.add_argument("dst", help="Output .npy path (int16)")
+
+
+def main():
+    args = parser.parse_args()
+    src = np.load(args.src, mmap_mode='r')
+    if src.ndim != 2:
+        print(f"ERROR: expected a 2D grid, got shape {src.shape}", file=sys.stderr)
+        return 1
+    if src.dtype == np.int16:
+        print(f"{args.src} is already int16; nothing to do")
+        return 0
+
+    dst = np.lib.format.open_memmap(args.dst, mode='w+', dtype=np.int16, shape=src.shape)
+    max_err = 0.0
+    for start in range(0, src.shape[0], CHUNK_ROWS):
+        block = np.asarray(src[start:start + CHUNK_ROWS], dtype=np.float64)
+        if block.min() < INT16_MIN or block.max() > INT16_MAX:
+            print(f"ERROR: rows {start}+ fall outside the int16 range", file=sys.stderr)
+            return 1
+        quantized = np.round(block)
+        dst[start:start + CHUNK_ROWS] = quantized
+        max_err = max(max_err, float(np.abs(quantized - block).max()))
+    dst.flush()
+
+    print(f"Saved {src.shape} int16 grid to {args.dst} "
+          f"({src.nbytes / 1e6:.0f}MB -> {dst.nbytes / 1e6:.0f}MB, max error {max_err:.2f}m)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main() or 0)
@@ -8,6 +8,7 @@ for trajectory calculations using Runge-Kutta integration.
 import numpy as np 
 import math
 import gc
+import random
 import elev
 import hashlib
 import os
@@ -19,7 +20,7 @@ from pathlib import Path
 import tempfile
 from windfile import WindFile
 from habsim import Simulator, Balloon
-from gefs import open_gefs, load_gefs
+from gefs import load_gefs, read_whichgefs
 
 # Try to import psutil for memory monitoring (optional)
 try:
@@ -62,6 +63,7 @@ _last_refresh_check = 0.0
 _last_successful_refresh = 0.0
 _REFRESH_COOLDOWN_SECONDS = 60.0  # skip redundant refreshes within 60s if cycle stable
 _cache_trim_thread_started = False
+_cache_trim_thread_lock = threading.Lock()  # get_simulator() calls the starter from request threads
 _IDLE_RESET_TIMEOUT = 120.0
 _IDLE_CLEAN_COOLDOWN = 120.0
 _last_activity_timestamp = time.time()
@@ -322,9 +324,7 @@ def refresh():
         old_gefs = _read_currgefs()
         
         try:
-            f = open_gefs('whichgefs')
-            new_gefs = f.readline().strip()
-            f.close()
+            new_gefs = read_whichgefs().partition('\n')[0].strip()
             
             # Only update if we got a valid timestamp (non-empty, not just whitespace)
             if not new_gefs:
@@ -992,6 +992,9 @@ def _periodic_cache_trim():
     Without this, each worker process maintains its own cache, and idle workers never trim.
     """
     global _last_idle_cleanup
+    # Stagger the first pass: workers fork together, so without jitter every worker's
+    # 20s trim cycle (lock acquisition, GC passes, malloc_trim) would fire in lockstep
+    time.sleep(random.uniform(0, 20))
     while True:
         try:
             now = time.time()
@@ -1085,13 +1088,26 @@ def _start_cache_trim_thread():
     """Start background thread for periodic cache trimming (called once per worker)
     This thread is critical for idle cleanup - it must start even if no simulators are accessed."""
     global _cache_trim_thread_started
-    if not _cache_trim_thread_started:
+    if _cache_trim_thread_started:
+        return  # Fast path: no lock once started
+    with _cache_trim_thread_lock:
+        if _cache_trim_thread_started:
+            return
         _cache_trim_thread_started = True
         worker_pid = os.getpid()
         thread = threading.Thread(target=_periodic_cache_trim, daemon=True, name=f"CacheTrimThread-{worker_pid}")
         thread.start()
         # Logging handled by post_fork hook for workers, module-level call logs for master process
 
+def _reset_cache_trim_thread_after_fork():
+    """Forked children (Gunicorn workers with preload_app=True) don't inherit the parent's
+    threads, so forget the parent's trim thread; the child starts its own on first use."""
+    global _cache_trim_thread_started, _cache_trim_thread_lock
+    _cache_trim_thread_started = False
+    _cache_trim_thread_lock = threading.Lock()  # May have been held by another thread at fork
+
+os.register_at_fork(after_in_child=_reset_cache_trim_thread_after_fork)
+
 # Start cleanup thread immediately when module is imported (after function definition)
 # This ensures idle cleanup works even if no simulators are accessed
 # The thread will monitor idle time and trigger cleanup after 120 seconds of inactivity
@@ -1471,11 +1487,12 @@ def simulate(simtime, lat, lon, rate, step, max_duration, alt, model, coefficien
                 path.extend([None] * 50)  # Extend by 50 more slots
             
             timestamp = (i.time - epoch).total_seconds()
-            path[path_index] = (float(timestamp), float(i.location.getLat()), float(i.location.getLon()), 
+            lat_i, lon_i = i.location
+            path[path_index] = (float(timestamp), float(lat_i), float(lon_i), 
                                float(i.alt), float(i.wind_vector[0]), float(i.wind_vector[1]), 0, 0)
             path_index += 1
             
-            if i.location.getLat() < -90 or i.location.getLat() > 90:
+            if lat_i < -90 or lat_i > 90:
                 break
         
         # Trim unused pre-allocated space
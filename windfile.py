@@ -6,6 +6,7 @@ Provides 4D interpolation for wind vectors at arbitrary lat/lon/alt/time.
 Thread-safe file loading with per-file locks to prevent zipfile contention.
 """
 import math
+import mmap
 import os
 import time
 import threading
@@ -19,6 +20,12 @@ from functools import lru_cache
 import numpy as np
 from numpy.lib.format import open_memmap
 
+# fcntl is POSIX-only; without it extractions are mapped without the in-use lock
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 _MEMMAP_LOCKS: dict[Path, threading.Lock] = {}
 _MEMMAP_LOCKS_LOCK = threading.Lock()
 # Per-file locks for entire file loading (prevents zipfile contention)
@@ -61,6 +68,12 @@ def _get_file_load_lock(path: Union[Path, BytesIO]) -> threading.Lock:
             _FILE_LOAD_LOCKS[path] = lock
         return lock
 
+def _prefault(array: np.ndarray):
+    """Touch one element per page so a memory-mapped array is resident before use."""
+    flat = array.reshape(-1)
+    step = max(1, mmap.PAGESIZE // flat.itemsize)
+    flat[::step].sum()
+
 # Cache altitude-to-pressure conversions (common altitudes in HAB simulations)
 @lru_cache(maxsize=10000)
 def _alt_to_hpa_cached(altitude_rounded):
@@ -78,8 +91,9 @@ class WindFile:
         
         Args:
             path: Path to NPZ file or BytesIO object
-            preload: If True, load full array into RAM (faster, uses more RAM).
-                    If False, use memory-mapping (slower but memory-efficient).
+            preload: If True, fault the full (shared, memory-mapped) array into RAM up front
+                    and index it as a plain ndarray (faster access during simulation).
+                    If False, pages are loaded lazily on first access.
                     Default: False (memory-efficient mode)
         """
         normalized_path = _normalize_path(path)
@@ -101,10 +115,15 @@ class WindFile:
                 self.interval = float(npz['interval'][()])
 
                 if isinstance(normalized_path, Path) and normalized_path.suffix == '.npz':
+                    # Both modes map the extracted .npy so every worker shares one page-cache
+                    # copy instead of each decompressing a private ~460MB array
+                    data = self._load_memmap_data(npz, normalized_path)
                     if preload:
-                        self.data = np.array(npz['data'], copy=True)
-                    else:
-                        self.data = self._load_memmap_data(npz, normalized_path)
+                        # Plain ndarray view (skips np.memmap's Python-level indexing hooks),
+                        # with every page faulted in now rather than during simulation
+                        data = data.view(np.ndarray)
+                        _prefault(data)
+                    self.data = data
                 else:
                     self.data = np.array(npz['data'], copy=True)
             finally:
@@ -165,6 +184,14 @@ class WindFile:
         Calling cleanup() while interpolate() or get() is executing will cause crashes.
         The caller is responsible for ensuring no concurrent access before calling cleanup().
         """
+        # Let cache cleanup evict the extraction again (see _hold_extraction)
+        extraction_lock = getattr(self, '_extraction_lock', None)
+        if extraction_lock is not None:
+            self._extraction_lock = None
+            try:
+                extraction_lock.close()
+            except OSError:
+                pass
         if hasattr(self, 'data') and self.data is not None:
             if isinstance(self.data, np.ndarray) and not hasattr(self.data, 'filename'):
                 try:
@@ -194,6 +221,23 @@ class WindFile:
             except Exception as e:
                 print(f"WARNING: WindFile cleanup failed for _interp_indices: {e}", flush=True)
 
+    def _hold_extraction(self, memmap_path: Path):
+        """
+        Take a shared flock on the extracted .npy for as long as this WindFile maps it.
+        
+        gefs cache cleanup skips extractions (and their .npz) that are flocked, so a
+        file an ensemble is reading isn't evicted and re-extracted from under it.
+        Released by cleanup(), or when the WindFile is garbage collected.
+        """
+        if fcntl is None:
+            return
+        try:
+            fh = open(memmap_path, 'rb')
+            fcntl.flock(fh.fileno(), fcntl.LOCK_SH)
+        except OSError:
+            return  # Best effort: the mapping itself works without it
+        self._extraction_lock = fh
+
     def _load_memmap_data(self, npz: np.lib.npyio.NpzFile, path: Path):
         """
         Load data using memory-mapping for memory efficiency.
@@ -226,6 +270,7 @@ class WindFile:
                     file_size = memmap_path.stat().st_size
                     if file_size > 0:
                         # Memory-map the existing file (instant, no decompression needed)
+                        self._hold_extraction(memmap_path)
                         memmap_data = np.load(memmap_path, mmap_mode='r')
                         if memmap_data is not None:
                             return memmap_data
@@ -299,6 +344,7 @@ class WindFile:
             # This is fast (just creates a memory mapping, no data copy)
             # The file is now available for fast access by this and other threads
             try:
+                self._hold_extraction(memmap_path)
                 memmap_data = np.load(memmap_path, mmap_mode='r')
                 if memmap_data is None:
                     raise RuntimeError(f"Failed to load memory-mapped data from {memmap_path}")